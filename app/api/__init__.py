@@ -14,6 +14,8 @@ from api.subscribers.views import router as subscribers_router
 from api.contacts.views import router as contacts_router
 from api.files.views import router as files_router
 from api.search.views import router as search_router
+from api.cache.views import router as cache_router
+from api.home.views import router as home_router
 
 
 router = APIRouter()
@@ -39,3 +41,5 @@ router.include_router(
 router.include_router(router=contacts_router, prefix="/contacts", tags=["Contacts"])
 router.include_router(router=files_router, prefix="/files", tags=["Files"])
 router.include_router(router=search_router, prefix="/search", tags=["Search"])
+router.include_router(router=cache_router, prefix="/cache", tags=["Cache"])
+router.include_router(router=home_router, prefix="/home", tags=["Home"])
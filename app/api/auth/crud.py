@@ -1,9 +1,10 @@
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import User, RefreshToken
+from core.auth.service import token_version_service, user_cache_service
 from security.utils import validate_password
 from api.auth.schemas import UserRegister, RefreshTokenCreate
 from api.users import crud as users_crud
@@ -33,6 +34,7 @@ async def confirm_registration(session: AsyncSession, user_id: uuid.UUID) -> boo
         return False
     user.is_active = True
     await session.commit()
+    user_cache_service.invalidate(user.id)
     # await session.refresh(user)
     return True
 
@@ -48,36 +50,61 @@ async def add_refresh_token(
     return token
 
 
-async def get_refresh_token(
+async def revoke_active_refresh_token(
     session: AsyncSession,
     jti: uuid.UUID,
-) -> RefreshToken | None:
-    stmt = select(RefreshToken).where(RefreshToken.jti == jti)
-    token = await session.scalar(statement=stmt)
-    return token
+) -> Row | None:
+    # Проверка и отзыв одним UPDATE ... RETURNING. Коммит делает вызывающий,
+    # чтобы отзыв и новый токен записались в одной транзакции
+    stmt = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.is_revoked.is_(False),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(is_revoked=True)
+        .returning(
+            RefreshToken.user_id,
+            RefreshToken.user_agent,
+            RefreshToken.ip_address,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    return result.one_or_none()
 
 
 async def revoke_refresh_tokens(
     session: AsyncSession,
     user_id: uuid.UUID,
-):
-    stmt = select(RefreshToken).where(RefreshToken.user_id == user_id)
-    result = list(await session.scalars(statement=stmt))
-
-    refresh_tokens: list[RefreshToken] = result.all()
-
-    for token in refresh_tokens:
-        token.is_revoked = False
-
+) -> list[Row]:
+    stmt = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.is_revoked.is_(False),
+        )
+        .values(is_revoked=True)
+        .returning(RefreshToken.jti, RefreshToken.expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
     await session.commit()
+    return list(result.all())
 
 
 async def revoke_refresh_token(
     session: AsyncSession,
     jti: uuid.UUID,
 ):
-    token = await get_refresh_token(session=session, jti=jti)
-    token.is_revoked = True
+    stmt = (
+        update(RefreshToken)
+        .where(RefreshToken.jti == jti)
+        .values(is_revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(stmt)
     await session.commit()
 
 
@@ -86,10 +113,14 @@ async def change_user_password(
 ):
     user = await users_crud.get_user_by_id(session=session, user_id=user_id)
 
-    if user.check_password(plain_password=password):
+    if await user.check_password(plain_password=password):
         raise ValueError("New password cannot be the same as the old one")
 
-    user.password = password
+    await user.set_password(password)
+    # Access токены, выпущенные со старым паролем, больше не принимаются
+    user.token_version += 1
     await session.commit()
     await session.refresh(user)
+    token_version_service.set_version(user.id, user.token_version)
+    user_cache_service.invalidate(user.id)
     return user
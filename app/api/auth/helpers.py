@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 from core.config import settings
+from core.models import User
 from security import utils as security_utils
 
 
@@ -10,14 +11,10 @@ TOKEN_TYPE_REFRESH = "refresh"
 
 def create_jwt_without_type(
     payload: dict,
-    private_key: str = settings.auth.private_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
     expire_minutes: int = settings.auth.registration_token_expire_minutes,
 ):
     return security_utils.encode_jwt(
         payload=payload,
-        private_key=private_key,
-        algorithm=algorithm,
         expire_minutes=expire_minutes,
     )
 
@@ -25,8 +22,6 @@ def create_jwt_without_type(
 def create_jwt(
     token_type: str,
     payload: dict,
-    private_key: str = settings.auth.private_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
     expire_minutes: int = settings.auth.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None,
 ):
@@ -37,20 +32,24 @@ def create_jwt(
 
     return security_utils.encode_jwt(
         payload=to_encode,
-        private_key=private_key,
-        algorithm=algorithm,
         expire_minutes=expire_minutes,
         expire_timedelta=expire_timedelta,
     )
 
 
-def check_jwt(
-    token: str | bytes,
-    public_key: str = settings.auth.public_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
-):
-    return security_utils.decode_jwt(
-        token=token,
-        public_key=public_key,
-        algorithm=algorithm,
+def check_jwt(token: str | bytes):
+    return security_utils.decode_jwt(token=token)
+
+
+def create_access_token(user: User) -> str:
+    # Роль и активность подписаны в токене, поэтому защищенные эндпоинты
+    # проверяют права без запроса к базе. ver отзывает токен до истечения
+    return create_jwt(
+        payload={
+            "sub": str(user.id),
+            "role": user.role,
+            "is_active": user.is_active,
+            "ver": user.token_version,
+        },
+        token_type=TOKEN_TYPE_ACCESS,
     )
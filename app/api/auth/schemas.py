@@ -21,6 +21,14 @@ class TokenInfo(BaseModel):
     token_type: str = "Bearer"
 
 
+class TokenUser(BaseModel):
+    # Пользователь по claims access токена, без запроса к базе
+    id: uuid.UUID
+    role: str
+    is_active: bool
+    token_version: int
+
+
 class RefreshTokenCreate(BaseModel):
     jti: uuid.UUID
     user_agent: str | None = None
@@ -2,19 +2,22 @@ import uuid
 from datetime import datetime, timezone, timedelta
 
 from jwt import InvalidTokenError, ExpiredSignatureError
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.db_helper import db_helper
+from core.auth.service import revoked_token_service, user_cache_service
+from core.password.service import password_service
 from core.email.service import email_service
-from core.models import User
+from core.helpers import is_not_modified
+from security.keys import key_manager
 from api.auth.helpers import (
     create_jwt_without_type,
     create_jwt,
+    create_access_token,
     check_jwt,
-    TOKEN_TYPE_ACCESS,
     TOKEN_TYPE_REFRESH,
 )
 from api.auth import crud
@@ -25,6 +28,7 @@ from api.auth.schemas import (
     UserRegister,
     UserChangePassword,
     TokenInfo,
+    TokenUser,
     RefreshTokenCreate,
 )
 from api.auth.dependencies import (
@@ -36,8 +40,32 @@ router = APIRouter()
 
 @router.get("/get-public-key/")
 async def get_public_key():
-    public_key = settings.auth.public_key_path.read_text()
-    return {"public_key": public_key}
+    return {"public_key": key_manager.public_key_pem}
+
+
+@router.get("/jwks/")
+async def get_jwks(request: Request):
+    # Документ собирается один раз при старте. Новый ключ нужно добавить
+    # в previous_public_key_paths заранее, чтобы клиенты успели обновить кэш
+    headers = {
+        "ETag": key_manager.jwks_etag,
+        "Cache-Control": f"public, max-age={settings.auth.jwks_cache_seconds}",
+    }
+    if is_not_modified(request=request, etag=key_manager.jwks_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=key_manager.jwks,
+        media_type="application/jwk-set+json",
+        headers=headers,
+    )
+
+
+@router.get("/password-hashing/stats/")
+async def get_password_hashing_stats(
+    admin: TokenUser = Depends(get_current_admin),
+):
+    return password_service.stats()
 
 
 @router.post("/register/", response_model=UserResponse)
@@ -78,7 +106,7 @@ async def register_user(
 @router.post("/send-register-invitation/")
 async def send_register_invitation(
     email: str,
-    admin: User = Depends(get_current_admin),
+    admin: TokenUser = Depends(get_current_admin),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_user_exists = (
@@ -150,12 +178,7 @@ async def login_user(
         )
 
     # Выпускаем новые access и refresh токены
-    access_token = create_jwt(
-        payload={
-            "sub": str(user.id),
-        },
-        token_type=TOKEN_TYPE_ACCESS,
-    )
+    access_token = create_access_token(user)
     refresh_token_jti = uuid.uuid4()
 
     refresh_token = create_jwt(
@@ -198,16 +221,23 @@ async def refresh_tokens(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     jti = refresh_token_payload["jti"]
-    user_id = refresh_token_payload["sub"]
+    revoked_exc = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token revoked",
+    )
 
-    # Получаем токен из БД
-    refresh_token_from_db = await crud.get_refresh_token(session=session, jti=jti)
+    # Повторное использование уже отозванного токена отклоняем без запроса к базе
+    if revoked_token_service.is_revoked(jti):
+        raise revoked_exc
 
-    if not refresh_token_from_db or refresh_token_from_db.is_revoked:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token revoked",
-        )
+    # Проверяем и отзываем старый токен одним запросом, новый токен
+    # записывается в той же транзакции
+    refresh_token_from_db = await crud.revoke_active_refresh_token(
+        session=session, jti=jti
+    )
+    if not refresh_token_from_db:
+        revoked_token_service.revoke(jti, refresh_token_payload["exp"])
+        raise revoked_exc
 
     # Проверяем аномалии
     user_agent = request.headers.get("User-Agent")
@@ -219,30 +249,24 @@ async def refresh_tokens(
     ):
 
         # Отзываем из-за аномалии
-        await crud.revoke_refresh_token(session, jti)
+        await session.commit()
+        revoked_token_service.revoke(jti, refresh_token_payload["exp"])
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Suspicious activity detected",
         )
 
-    # Получаем пользователя
-    user = await users_crud.get_user_by_id(session=session, user_id=user_id)
+    # Получаем пользователя. При ошибке транзакция откатывается,
+    # старый токен остается неотозванным
+    user = await user_cache_service.get_user(refresh_token_from_db.user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    # Отзываем старый токен (после всех проверок)
-    await crud.revoke_refresh_token(session=session, jti=jti)
-
     # Выпускаем новые access и refresh токены
-    access_token = create_jwt(
-        payload={
-            "sub": str(user.id),
-        },
-        token_type=TOKEN_TYPE_ACCESS,
-    )
+    access_token = create_access_token(user)
     refresh_token_jti = uuid.uuid4()
 
     refresh_token = create_jwt(
@@ -253,11 +277,7 @@ async def refresh_tokens(
         token_type=TOKEN_TYPE_REFRESH,
         expire_timedelta=timedelta(days=settings.auth.refresh_token_expire_days),
     )
-    # Собираем данные с Request для сохранения refresh токена в БД
-    user_agent = request.headers.get("User-Agent")
-    ip_address = request.client.host
-
-    # Добавляем refresh токен в БД
+    # Добавляем refresh токен в БД, коммит фиксирует и отзыв старого
     await crud.add_refresh_token(
         session=session,
         token=RefreshTokenCreate(
@@ -269,6 +289,7 @@ async def refresh_tokens(
         ),
         user_id=user.id,
     )
+    revoked_token_service.revoke(jti, refresh_token_payload["exp"])
 
     token_info = TokenInfo(
         access_token=access_token,
@@ -285,6 +306,7 @@ async def logout_device(
 ):
     jti = refresh_token_payload["jti"]
     await crud.revoke_refresh_token(session=session, jti=jti)
+    revoked_token_service.revoke(jti, refresh_token_payload["exp"])
 
 
 @router.post("/logout-all/")
@@ -293,7 +315,10 @@ async def logout_all_devices(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     user_id = refresh_token_payload["sub"]
-    await crud.revoke_refresh_tokens(session=session, user_id=user_id)
+    revoked_tokens = await crud.revoke_refresh_tokens(session=session, user_id=user_id)
+    for token in revoked_tokens:
+        revoked_token_service.revoke(token.jti, token.expires_at.timestamp())
+    await users_crud.revoke_access_tokens(session=session, user_id=user_id)
 
 
 @router.post("/change-password/")
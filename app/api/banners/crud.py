@@ -4,6 +4,9 @@ from sqlalchemy import select, delete, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Banner
+from core.cache.service import cache_service
+
+CACHE_TAG = "banners"
 
 
 async def create_banner(
@@ -20,7 +23,9 @@ async def create_banner(
         count_order=count_order,
     )
 
-    await session.add(banner)
+    session.add(banner)
+    await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(banner)
     return banner
 
@@ -56,6 +61,7 @@ async def update_banner(
             setattr(current_banner, field, value)
 
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{current_banner.id}")
     await session.refresh(current_banner)
 
     return current_banner
@@ -71,5 +77,6 @@ async def delete_banner(
 
     await session.delete(banner)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{banner_id}")
 
     return True
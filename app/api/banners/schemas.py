@@ -1,6 +1,8 @@
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+from core.image.service import image_service
 
 
 class BannerResponse(BaseModel):
@@ -9,3 +11,8 @@ class BannerResponse(BaseModel):
     redirect_url: str
     is_active: bool
     count_order: int
+
+    @computed_field
+    @property
+    def image_srcset(self) -> dict[str, dict[int, str]]:
+        return image_service.get_srcset(self.image_url)
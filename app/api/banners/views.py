@@ -5,13 +5,15 @@ from fastapi import APIRouter, HTTPException, status, Form, UploadFile, Depends,
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.file.service import file_service, BANNERS_FOLDER
-from core.models import User
+from core.models import Banner
 from core.db_helper import db_helper
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.banners.schemas import BannerResponse
 from api.banners import crud
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
 @router.post("/", response_model=BannerResponse)
@@ -20,11 +22,11 @@ async def create_banner(
     redirect_url: Annotated[str, Form()],
     count_order: Annotated[int, Form(gt=0)],
     is_active: Annotated[bool, Form()] = True,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     # Сохраняем изображение баннера
-    image_url = await file_service.save_upload_file(
+    image_url = await file_service.save_image_file(
         upload_file=image,
         subdirectory=BANNERS_FOLDER,
     )
@@ -40,7 +42,11 @@ async def create_banner(
     return banner
 
 
-@router.get("/", response_model=list[BannerResponse])
+@router.get(
+    "/",
+    response_model=list[BannerResponse],
+    dependencies=[Depends(collection_etag(Banner))],
+)
 async def get_banners(
     skip: int = Query(0, ge=0),
     limit: int = Query(6, ge=1),
@@ -50,7 +56,11 @@ async def get_banners(
     return banners
 
 
-@router.get("/{banner_id}/", response_model=BannerResponse)
+@router.get(
+    "/{banner_id}/",
+    response_model=BannerResponse,
+    dependencies=[Depends(entity_etag(Banner, "banner_id"))],
+)
 async def get_banner_by_id(
     banner_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -72,7 +82,7 @@ async def update_banner(
     redirect_url: Annotated[str | None, Form()] = None,
     count_order: Annotated[int | None, Form(gt=0)] = None,
     is_active: Annotated[bool | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     current_banner = await crud.get_banner_by_id(session=session, banner_id=banner_id)
@@ -82,9 +92,10 @@ async def update_banner(
             detail="Banner not found",
         )
 
+    image_url = None
     if image:
+        image_url = await file_service.save_image_file(image, BANNERS_FOLDER)
         await file_service.delete_file(current_banner.image_url)
-        image_url = await file_service.save_upload_file(image, BANNERS_FOLDER)
 
     banner = await crud.update_banner(
         session=session,
@@ -101,7 +112,7 @@ async def update_banner(
 @router.delete("/{banner_id}/")
 async def delete_banner(
     banner_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_banner(session=session, banner_id=banner_id)
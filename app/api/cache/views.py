@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from core.cache.service import cache_service
+from api.dependencies import get_current_admin
+from api.auth.schemas import TokenUser
+
+router = APIRouter()
+
+
+@router.get("/stats/")
+async def get_cache_stats(
+    admin: TokenUser = Depends(get_current_admin),
+):
+    return cache_service.stats()
@@ -4,10 +4,10 @@ import json
 
 from fastapi import APIRouter, Depends
 
-from core.models import User
 from core.config import BASE_DIR
 from core.contacts.service import contacts_service
 from api.dependencies import get_current_active_user
+from api.auth.schemas import TokenUser
 from api.contacts.schemas import ContactsCreate, ContactsUpdate, ContactsResponse
 
 
@@ -23,7 +23,7 @@ async def get_contacts():
 @router.patch("/", response_model=ContactsResponse)
 async def update_contacts(
     contacts_in: ContactsUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     update_data = contacts_in.model_dump(exclude_none=True)
 
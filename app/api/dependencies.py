@@ -1,11 +1,19 @@
+import uuid
+
 from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 
+from core.models import Base
 from core.models.user import User, ADMIN_ROLE
 from core.db_helper import db_helper
-from api.users.crud import get_user_by_id
+from core.auth.service import token_version_service, user_cache_service
+from core.helpers import make_etag
+from api.auth.helpers import TOKEN_TYPE_ACCESS
+from api.auth.schemas import TokenUser
+from api.helpers import set_validators
 from security import utils as security_utils
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -13,31 +21,44 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(db_helper.session_getter),
-) -> User:
+async def get_token_user(token: str = Depends(oauth2_scheme)) -> TokenUser:
     try:
         payload = security_utils.decode_jwt(token=token)
-        user_id = payload["sub"]
-        user = await get_user_by_id(session=session, user_id=user_id)
-        return user
+        if payload.get("type") != TOKEN_TYPE_ACCESS:
+            raise InvalidTokenError
+
+        token_user = TokenUser(
+            id=payload["sub"],
+            role=payload["role"],
+            is_active=payload["is_active"],
+            token_version=payload["ver"],
+        )
 
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Confirmation token expired",
         )
-    except (InvalidTokenError, ValueError):
+    except (InvalidTokenError, ValueError, KeyError):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid token",
         )
 
+    # Версия меняется при смене пароля, блокировке и удалении пользователя
+    version = await token_version_service.get_version(token_user.id)
+    if version != token_user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+        )
+
+    return token_user
+
 
 async def get_current_active_user(
-    user: User = Depends(get_current_user),
-) -> User:
+    user: TokenUser = Depends(get_token_user),
+) -> TokenUser:
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,8 +69,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin(
-    user: User = Depends(get_current_active_user),
-):
+    user: TokenUser = Depends(get_current_active_user),
+) -> TokenUser:
     if user.role != ADMIN_ROLE:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -57,3 +78,64 @@ async def get_current_admin(
         )
 
     return user
+
+
+async def get_current_user(
+    token_user: TokenUser = Depends(get_current_active_user),
+) -> User:
+    # Полная модель пользователя, только для эндпоинтов, которым она нужна
+    user = await user_cache_service.get_user(token_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+        )
+
+    return user
+
+
+def collection_etag(model: type[Base]):
+    # Версия коллекции - max(updated_at) и количество строк (учитывает удаления).
+    # Last-Modified не отправляется: по max(updated_at) удаление строки
+    # не заметно, поэтому коллекция проверяется только по ETag
+    async def check_collection_etag(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(db_helper.session_getter),
+    ):
+        stmt = select(func.max(model.updated_at), func.count()).select_from(model)
+        updated_at, count = (await session.execute(stmt)).one()
+
+        set_validators(
+            request=request,
+            response=response,
+            etag=make_etag(model.__tablename__, updated_at, count),
+        )
+
+    return check_collection_etag
+
+
+def entity_etag(model: type[Base], id_param: str):
+    async def check_entity_etag(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(db_helper.session_getter),
+    ):
+        try:
+            entity_id = uuid.UUID(request.path_params[id_param])
+        except ValueError:
+            return  # Ошибку валидации вернет сам эндпоинт
+
+        stmt = select(model.updated_at).where(model.id == entity_id)
+        updated_at = await session.scalar(stmt)
+        if not updated_at:
+            return  # 404 вернет сам эндпоинт
+
+        set_validators(
+            request=request,
+            response=response,
+            etag=make_etag(model.__tablename__, entity_id, updated_at),
+            last_modified=updated_at,
+        )
+
+    return check_entity_etag
@@ -4,6 +4,11 @@ from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Document
+from core.cache.service import cache_service
+from core.models.search_document import DOCUMENT_ENTITY
+from core.search.documents import search_document_service
+
+CACHE_TAG = "documents"
 
 
 async def create_document(
@@ -19,7 +24,10 @@ async def create_document(
     )
 
     session.add(document)
+    await session.flush()
+    await search_document_service.save_document(session=session, document=document)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(document)
 
     return document
@@ -48,7 +56,9 @@ async def deactivate_document(session: AsyncSession, document_id: uuid.UUID) ->
         return False
 
     document.is_active = False
+    await search_document_service.save_document(session=session, document=document)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{document_id}")
     return True
 
 
@@ -58,6 +68,10 @@ async def delete_document(session: AsyncSession, document_id: uuid.UUID) -> bool
         return False
 
     await session.delete(document)
+    await search_document_service.delete(
+        session=session, entity_type=DOCUMENT_ENTITY, entity_id=document_id
+    )
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{document_id}")
 
     return True
@@ -4,15 +4,17 @@ from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, UploadFile, Form, HTTPException, status
 
-from core.models import User
+from core.models import Document
 from core.file.service import file_service
 from core.db_helper import db_helper
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.documents import crud
 from api.documents.schemas import DocumentResponse
 
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
 @router.post("/", response_model=DocumentResponse)
@@ -20,7 +22,7 @@ async def upload_document(
     file: UploadFile,
     title: Annotated[str, Form()],
     is_active: Annotated[bool, Form()] = True,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     file_url = await file_service.save_document_file(file)
@@ -34,7 +36,11 @@ async def upload_document(
     return document
 
 
-@router.get("/", response_model=list[DocumentResponse])
+@router.get(
+    "/",
+    response_model=list[DocumentResponse],
+    dependencies=[Depends(collection_etag(Document))],
+)
 async def get_documents(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
@@ -42,7 +48,11 @@ async def get_documents(
     return documents
 
 
-@router.get("/{document_id}/", response_model=DocumentResponse)
+@router.get(
+    "/{document_id}/",
+    response_model=DocumentResponse,
+    dependencies=[Depends(entity_etag(Document, "document_id"))],
+)
 async def get_document_by_id(
     document_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -60,7 +70,7 @@ async def get_document_by_id(
 @router.delete("/{document_id}/deactivate/")
 async def deactivate_document(
     document_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deactivated = await crud.deactivate_document(
@@ -78,7 +88,7 @@ async def deactivate_document(
 @router.delete("/{document_id}/")
 async def delete_document(
     document_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_document(session=session, document_id=document_id)
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends
 
-from core.models import User
 from core.email.template_service import (
     email_template_service,
     CHANGING_PASSWORD_TEMPLATE_NAME,
@@ -11,6 +10,7 @@ from core.email.template_service import (
     MAILING_TEMPLATE_NAME,
 )
 from api.dependencies import get_current_active_user
+from api.auth.schemas import TokenUser
 from api.email_templates.schemas import EmailTemplateUpdate
 
 router = APIRouter()
@@ -18,7 +18,7 @@ router = APIRouter()
 
 @router.get("/changing-password/")
 async def get_changing_password_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         CHANGING_PASSWORD_TEMPLATE_NAME,
@@ -29,7 +29,7 @@ async def get_changing_password_template(
 
 @router.get("/confirmation_register/")
 async def get_confirmation_register_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         CONFIRMATION_REGISTER_TEMPLATE_NAME,
@@ -40,7 +40,7 @@ async def get_confirmation_register_template(
 
 @router.get("/feedback-response/")
 async def get_feedback_response_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         FEEDBACK_RESPONSE_TEMPLATE_NAME,
@@ -51,7 +51,7 @@ async def get_feedback_response_template(
 
 @router.get("/register-invitation/")
 async def get_register_invitation_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         REGISTER_INVITATION_TEMPLATE_NAME,
@@ -62,7 +62,7 @@ async def get_register_invitation_template(
 
 @router.get("/confirmation-subscription/")
 async def get_confirmation_subscription_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         CONFIRMATION_SUBSCRIPTION_TEMPLATE_NAME,
@@ -73,7 +73,7 @@ async def get_confirmation_subscription_template(
 
 @router.get("/mailing/")
 async def get_mailing_template(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     template_content = await email_template_service.get_template_content(
         MAILING_TEMPLATE_NAME,
@@ -85,7 +85,7 @@ async def get_mailing_template(
 @router.patch("/changing-password/")
 async def update_changing_password_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in, template_name=CHANGING_PASSWORD_TEMPLATE_NAME
@@ -96,7 +96,7 @@ async def update_changing_password_template(
 @router.patch("/confirmation_register/")
 async def update_confirmation_register_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in, template_name=CONFIRMATION_REGISTER_TEMPLATE_NAME
@@ -107,7 +107,7 @@ async def update_confirmation_register_template(
 @router.patch("/feedback-response/")
 async def update_feedback_response_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in, template_name=FEEDBACK_RESPONSE_TEMPLATE_NAME
@@ -118,7 +118,7 @@ async def update_feedback_response_template(
 @router.patch("/register-invitation/")
 async def update_register_invitation_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in, template_name=REGISTER_INVITATION_TEMPLATE_NAME
@@ -129,7 +129,7 @@ async def update_register_invitation_template(
 @router.patch("/confirmation-subscription/")
 async def update_confirmation_subscription_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in,
@@ -141,7 +141,7 @@ async def update_confirmation_subscription_template(
 @router.patch("/mailing/")
 async def update_mailing_template(
     template_in: EmailTemplateUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
 ):
     new_template = await email_template_service.update_template_content(
         template_in,
@@ -5,6 +5,11 @@ from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Event
+from core.cache.service import cache_service
+from core.models.search_document import EVENT_ENTITY
+from core.search.documents import search_document_service
+
+CACHE_TAG = "events"
 
 
 async def get_events(
@@ -48,7 +53,10 @@ async def create_event(
     )
 
     session.add(event)
+    await session.flush()
+    await search_document_service.save_event(session=session, event=event)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(event)
 
     return event
@@ -64,7 +72,9 @@ async def update_event(
         if hasattr(current_event, field) and value is not None:
             setattr(current_event, field, value)
 
+    await search_document_service.save_event(session=session, event=current_event)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{current_event.id}")
     await session.refresh(current_event)
 
     return current_event
@@ -79,6 +89,10 @@ async def delete_event(
         return False
 
     await session.delete(event)
+    await search_document_service.delete(
+        session=session, entity_type=EVENT_ENTITY, entity_id=event_id
+    )
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{event_id}")
 
     return True
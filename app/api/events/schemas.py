@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+from core.image.service import image_service
 
 
 class EventResponse(BaseModel):
@@ -12,3 +14,8 @@ class EventResponse(BaseModel):
     image_url: str
     is_active: bool
     location: str | None = None
+
+    @computed_field
+    @property
+    def image_srcset(self) -> dict[str, dict[int, str]]:
+        return image_service.get_srcset(self.image_url)
@@ -5,18 +5,24 @@ import uuid
 from fastapi import APIRouter, HTTPException, status, Depends, Form, UploadFile, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
+from core.models import Event
 from core.db_helper import db_helper
 from core.file.service import file_service, EVENTS_FOLDER
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.events.schemas import EventResponse
 from api.events import crud
 
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
-@router.get("/", response_model=list[EventResponse])
+@router.get(
+    "/",
+    response_model=list[EventResponse],
+    dependencies=[Depends(collection_etag(Event))],
+)
 async def get_events(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
@@ -26,7 +32,11 @@ async def get_events(
     return events
 
 
-@router.get("/{event_id}/", response_model=EventResponse)
+@router.get(
+    "/{event_id}/",
+    response_model=EventResponse,
+    dependencies=[Depends(entity_etag(Event, "event_id"))],
+)
 async def get_event_by_id(
     event_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -49,10 +59,10 @@ async def create_event(
     is_active: Annotated[bool, Form()],
     event_date: Annotated[datetime | None, Form()] = None,
     location: Annotated[str | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    image_url = await file_service.save_upload_file(image, EVENTS_FOLDER)
+    image_url = await file_service.save_image_file(image, EVENTS_FOLDER)
     event = await crud.create_event(
         session=session,
         title=title,
@@ -75,7 +85,7 @@ async def update_event(
     is_active: Annotated[bool | None, Form()] = None,
     event_date: Annotated[datetime | None, Form()] = None,
     location: Annotated[str | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     current_event = await crud.get_event_by_id(session=session, event_id=event_id)
@@ -85,11 +95,12 @@ async def update_event(
             detail="Event not found",
         )
 
+    image_url = None
     if image:
+        image_url = await file_service.save_image_file(image, EVENTS_FOLDER)
         await file_service.delete_file(current_event.image_url)
-        image_url = await file_service.save_upload_file(image, EVENTS_FOLDER)
 
-    event = crud.update_event(
+    event = await crud.update_event(
         session=session,
         current_event=current_event,
         title=title,
@@ -106,7 +117,7 @@ async def update_event(
 @router.delete("/{event_id}/")
 async def delete_event(
     event_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_event(session=session, event_id=event_id)
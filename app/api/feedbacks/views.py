@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db_helper import db_helper
-from core.models import User
 from core.email.service import email_service
 from api.dependencies import get_current_active_user
+from api.auth.schemas import TokenUser
 from api.feedbacks.schemas import FeedbackResponse, FeedbackCreate, FeedbackAnswer
 from api.feedbacks import crud
 
@@ -15,7 +15,7 @@ router = APIRouter()
 
 @router.get("/", response_model=list[FeedbackResponse])
 async def get_feedbacks(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     feedbacks = await crud.get_feedbacks(session=session)
@@ -25,7 +25,7 @@ async def get_feedbacks(
 @router.get("/{feedback_id}/", response_model=FeedbackResponse)
 async def get_feedback_by_id(
     feedback_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     feedback = await crud.get_feedback_by_id(session=session, feedback_id=feedback_id)
@@ -51,7 +51,7 @@ async def create_feedback(
 @router.delete("/{feedback_id}/")
 async def delete_feedback(
     feedback_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_feedback(session=session, feedback_id=feedback_id)
@@ -68,7 +68,7 @@ async def delete_feedback(
 async def answer_feedback(
     feedback_answer: FeedbackAnswer,
     feedback_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     """Эндпоинт для ответа с админ-панели на feedback"""
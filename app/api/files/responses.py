@@ -0,0 +1,70 @@
+from secrets import token_hex
+
+import anyio
+from fastapi.responses import FileResponse
+from starlette.types import Send
+
+
+class RangeFileResponse(FileResponse):
+    # Starlette отдает несколько диапазонов с Content-Range вместо Content-Type
+    # multipart/byteranges и разделяет части через \n. Здесь ответ собирается
+    # по RFC 9110 (14.6), а файл читается только в запрошенных диапазонах
+    async def _handle_multiple_ranges(
+        self,
+        send: Send,
+        ranges: list[tuple[int, int]],
+        file_size: int,
+        send_header_only: bool,
+    ) -> None:
+        boundary = token_hex(13)
+        content_type = self.headers["content-type"]
+        part_headers = [
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: bytes {start}-{end - 1}/{file_size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode("latin-1")
+        content_length = len(closing) + sum(
+            len(part_header) + end - start + 2
+            for part_header, (start, end) in zip(part_headers, ranges)
+        )
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 206,
+                "headers": self.raw_headers,
+            }
+        )
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            for part_header, (start, end) in zip(part_headers, ranges):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": part_header,
+                        "more_body": True,
+                    }
+                )
+                await file.seek(start)
+                while start < end:
+                    chunk = await file.read(min(self.chunk_size, end - start))
+                    if not chunk:
+                        break
+                    start += len(chunk)
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+                await send(
+                    {"type": "http.response.body", "body": b"\r\n", "more_body": True}
+                )
+
+        await send({"type": "http.response.body", "body": closing, "more_body": False})
@@ -1,51 +1,132 @@
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+import re
 from pathlib import Path
+from email.utils import format_datetime
+from urllib.parse import quote
 
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import RedirectResponse
 from core.config import settings
+from core.file.service import file_service
+from core.helpers import is_not_modified
+from api.files.responses import RangeFileResponse
+from api.helpers import select_encoding
 
 router = APIRouter()
 
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+}
+# SVG может содержать скрипты, поэтому скачивается, а не открывается
+# в браузере на домене API
+ATTACHMENT_TYPES = {"image/svg+xml"}
+# Даже открытый в браузере файл не выполняет скрипты и не угадывает тип
+SECURITY_HEADERS = {
+    "Content-Security-Policy": "sandbox",
+    "X-Content-Type-Options": "nosniff",
+}
 
-@router.get("/{file_path:path}/")
-async def get_file(file_path: str):
-    full_file_path = settings.file.uploads_dir / file_path
+# Имена uuid4().hex или хеш содержимого (и их уменьшенные копии) никогда
+# не переиспользуются для другого содержимого, такие файлы можно кэшировать навсегда
+IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{32}(?:[0-9a-f]{32})?(?:_w\d+)?\.\w+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# Редирект кэшируется меньше срока жизни подписанной ссылки
+PRESIGNED_CACHE_CONTROL = (
+    f"private, max-age={settings.storage.presign_expires_seconds // 2}"
+)
 
-    try:
-        full_file_path.resolve().relative_to(settings.file.uploads_dir.resolve())
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file path",
-        )
 
-    if not full_file_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found",
+# HEAD позволяет клиенту узнать размер и валидаторы перед докачкой
+@router.api_route("/{file_path:path}/", methods=["GET", "HEAD"])
+async def get_file(file_path: str, request: Request):
+    # Файлы из внешнего хранилища клиент скачивает напрямую по подписанной ссылке
+    download_url = await file_service.get_download_url(file_path)
+    if download_url:
+        return RedirectResponse(
+            download_url,
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": PRESIGNED_CACHE_CONTROL},
         )
 
-    if not full_file_path.is_file():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Not a file",
-        )
+    file_stat = file_service.get_file_stat(file_path)
+
+    # Для текстовых файлов отдаем заранее сжатую копию, если клиент ее принимает.
+    # У копии свои валидаторы: это другое представление того же ресурса
+    encoding = select_encoding(
+        request.headers.get("accept-encoding"), file_stat.encodings
+    )
+    content_stat = file_stat.encodings[encoding] if encoding else file_stat
 
-    # Определяем MIME тип
-    extension = full_file_path.suffix.lower()
-    media_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-        ".gif": "image/gif",
-        ".svg": "image/svg+xml",
+    headers = {
+        "ETag": content_stat.etag,
+        "Last-Modified": format_datetime(content_stat.last_modified, usegmt=True),
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL
+            if IMMUTABLE_NAME.match(file_stat.path.name)
+            else REVALIDATE_CACHE_CONTROL
+        ),
+        **SECURITY_HEADERS,
     }
+    if file_stat.encodings:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    if is_not_modified(
+        request=request,
+        etag=content_stat.etag,
+        last_modified=content_stat.last_modified,
+    ):
+        return Response(status_code=304, headers=headers)
+
+    # Определяем MIME тип, известные типы браузер может показать сам
+    media_type = MEDIA_TYPES.get(file_stat.path.suffix.lower())
+    disposition_type = (
+        "inline" if media_type and media_type not in ATTACHMENT_TYPES else "attachment"
+    )
+
+    if settings.file.offload_mode != "none":
+        # Тело и диапазоны отдает прокси, API только проверяет путь
+        headers.update(
+            {
+                "Content-Type": media_type or "application/octet-stream",
+                "Content-Disposition": (
+                    f'{disposition_type}; filename="{file_stat.path.name}"'
+                ),
+                _get_offload_header(): _get_offload_target(content_stat.path),
+            }
+        )
+        return Response(headers=headers)
+
+    # Range / If-Range и ответы 206 обрабатывает FileResponse
+    return RangeFileResponse(
+        content_stat.path,
+        media_type=media_type or "application/octet-stream",
+        filename=file_stat.path.name,
+        stat_result=content_stat.stat_result,
+        headers=headers,
+        content_disposition_type=disposition_type,
+    )
+
+
+def _get_offload_header() -> str:
+    if settings.file.offload_mode == "x-accel":
+        return "X-Accel-Redirect"
+
+    return "X-Sendfile"
+
 
-    media_type = media_types.get(extension, "application/octet-stream")
+def _get_offload_target(path: Path) -> str:
+    if settings.file.offload_mode == "x-sendfile":
+        return str(path)
 
-    return FileResponse(
-        full_file_path,
-        media_type=media_type,
-        filename=full_file_path.name,
+    relative_path = path.relative_to(settings.file.uploads_dir.resolve())
+    return (
+        settings.file.offload_prefix.rstrip("/") + "/" + quote(relative_path.as_posix())
     )
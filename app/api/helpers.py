@@ -1,6 +1,15 @@
-from datetime import datetime
+import base64
+import uuid
+from datetime import date, datetime
+from email.utils import format_datetime
+from typing import Iterable, Sequence
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row
+
+from core.helpers import is_not_modified
+from core.image.service import image_service
 
 
 def parse_str_to_date(date: str) -> datetime:
@@ -15,3 +24,82 @@ def parse_str_to_date(date: str) -> datetime:
 
 def parse_str_to_datetime(datetime: str) -> datetime:
     pass
+
+
+def encode_cursor(cursor_date: date, cursor_id: uuid.UUID) -> str:
+    raw = f"{cursor_date.isoformat()}:{cursor_id.hex}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, uuid.UUID]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        cursor_date, cursor_id = raw.split(":")
+        return date.fromisoformat(cursor_date), uuid.UUID(hex=cursor_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def rows_response(
+    rows: Sequence[Row],
+    headers: dict[str, str] | None = None,
+    image_field: str | None = None,
+) -> ORJSONResponse:
+    # Сериализуем Core-строки напрямую, минуя ORM-объекты и Pydantic модели
+    content = [row._asdict() for row in rows]
+    if image_field:
+        srcset_field = f"{image_field.removesuffix('_url')}_srcset"
+        for item in content:
+            item[srcset_field] = image_service.get_srcset(item[image_field])
+
+    return ORJSONResponse(content=content, headers=headers)
+
+
+def set_validators(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+):
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if is_not_modified(request=request, etag=etag, last_modified=last_modified):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+    response.headers.update(headers)
+
+
+def select_encoding(
+    accept_encoding: str | None,
+    encodings: Iterable[str],
+) -> str | None:
+    # Первая по предпочтению сервера кодировка, которую принимает клиент.
+    # q=0 означает явный отказ (RFC 9110)
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+
+    return None
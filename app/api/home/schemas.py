@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from api.banners.schemas import BannerResponse
+from api.news.schemas import NewsPreviewResponse
+from api.events.schemas import EventResponse
+from api.partners.schemas import PartnerResponse
+from api.polls.schemas import PollResponse
+from api.contacts.schemas import ContactsResponse
+
+
+class HomeResponse(BaseModel):
+    banners: list[BannerResponse]
+    news: list[NewsPreviewResponse]
+    news_next_cursor: str | None = None
+    events: list[EventResponse]
+    partners: list[PartnerResponse]
+    polls: list[PollResponse]
+    contacts: ContactsResponse
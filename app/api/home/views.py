@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from fastapi import APIRouter
+
+from core.db_helper import db_helper
+from core.cache.service import cached_route
+from core.contacts.service import contacts_service, CACHE_TAG as CONTACTS_CACHE_TAG
+from api.banners import crud as banners_crud
+from api.news import crud as news_crud
+from api.events import crud as events_crud
+from api.partners import crud as partners_crud
+from api.polls import crud as polls_crud
+from api.news.helpers import cut_page
+from api.home.schemas import HomeResponse
+
+router = APIRouter(
+    route_class=cached_route(
+        banners_crud.CACHE_TAG,
+        news_crud.CACHE_TAG,
+        events_crud.CACHE_TAG,
+        partners_crud.CACHE_TAG,
+        polls_crud.CACHE_TAG,
+        CONTACTS_CACHE_TAG,
+    )
+)
+
+
+async def _run_in_session(
+    query: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> Any:
+    # Одна AsyncSession не допускает параллельных запросов,
+    # поэтому каждый запрос берет свое соединение из пула
+    async with db_helper.session_factory() as session:
+        return await query(session=session, **kwargs)
+
+
+@router.get("/", response_model=HomeResponse, response_model_exclude_none=True)
+async def get_home():
+    banners, news, events, partners, polls, contacts = await asyncio.gather(
+        _run_in_session(banners_crud.get_banners),
+        _run_in_session(
+            news_crud.get_news_preview,
+            limit=news_crud.NEWS_PAGE_SIZE + 1,
+        ),
+        _run_in_session(events_crud.get_events),
+        _run_in_session(partners_crud.get_partners),
+        _run_in_session(polls_crud.get_polls),
+        contacts_service.read_contacts(),
+    )
+    news, news_next_cursor = cut_page(news, news_crud.NEWS_PAGE_SIZE)
+
+    return {
+        "banners": banners,
+        "news": [row._asdict() for row in news],
+        "news_next_cursor": news_next_cursor,
+        "events": events,
+        "partners": partners,
+        "polls": polls,
+        "contacts": contacts,
+    }
@@ -1,21 +1,69 @@
 import uuid
 from datetime import date
+from typing import Sequence
 
-from sqlalchemy import select, delete
+from sqlalchemy import Row, Select, select, delete, desc, tuple_
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import News, NewsType
+from core.cache.service import cache_service
+from core.models.search_document import NEWS_ENTITY
+from core.search.documents import search_document_service
+from core.search.service import suggestion_service
 
+NEWS_PAGE_SIZE = 20
+NEWS_MAX_PAGE_SIZE = 100
 
-async def get_news(session: AsyncSession) -> list[News]:
-    stmt = select(News).options(joinedload(News.type))
+CACHE_TAG = "news"
+
+# Колонки превью: достаточно для карточек ленты, поиска и главной, без тяжелого body
+NEWS_PREVIEW_COLUMNS = (News.id, News.image_url, News.min_text, News.news_date)
+
+
+def _paginate_news(
+    stmt: Select,
+    limit: int,
+    after: tuple[date, uuid.UUID] | None = None,
+    type_id: uuid.UUID | None = None,
+) -> Select:
+    # Keyset-пагинация по (news_date, id): стоимость страницы не зависит от глубины
+    if type_id:
+        stmt = stmt.where(News.type_id == type_id)
+
+    if after:
+        stmt = stmt.where(tuple_(News.news_date, News.id) < tuple_(*after))
+
+    return stmt.order_by(desc(News.news_date), desc(News.id)).limit(limit)
+
+
+async def get_news(
+    session: AsyncSession,
+    limit: int = NEWS_PAGE_SIZE,
+    after: tuple[date, uuid.UUID] | None = None,
+    type_id: uuid.UUID | None = None,
+) -> list[News]:
+    stmt = _paginate_news(select(News), limit=limit, after=after, type_id=type_id)
     result = await session.scalars(stmt)
     news = result.all()
 
     return list(news)
 
 
+async def get_news_preview(
+    session: AsyncSession,
+    limit: int = NEWS_PAGE_SIZE,
+    after: tuple[date, uuid.UUID] | None = None,
+    type_id: uuid.UUID | None = None,
+) -> Sequence[Row]:
+    stmt = _paginate_news(
+        select(*NEWS_PREVIEW_COLUMNS), limit=limit, after=after, type_id=type_id
+    )
+    result = await session.execute(stmt)
+
+    return result.all()
+
+
 async def get_news_by_id(
     session: AsyncSession,
     news_id: uuid.UUID,
@@ -47,8 +95,13 @@ async def create_news(
     )
 
     session.add(news)
+    await session.flush()
+    await search_document_service.save_news(session=session, news=news)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(news)
+
+    suggestion_service.add_news(news.id, news.title, news.keywords)
     return news
 
 
@@ -61,9 +114,14 @@ async def update_news(
         if hasattr(current_news, field) and value is not None:
             setattr(current_news, field, value)
 
+    await search_document_service.save_news(session=session, news=current_news)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{current_news.id}")
     await session.refresh(current_news)
 
+    suggestion_service.add_news(
+        current_news.id, current_news.title, current_news.keywords
+    )
     return current_news
 
 
@@ -76,8 +134,13 @@ async def delete_news(
         return False
 
     await session.delete(news)
+    await search_document_service.delete(
+        session=session, entity_type=NEWS_ENTITY, entity_id=news_id
+    )
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{news_id}")
 
+    suggestion_service.remove_news(news_id)
     return True
 
 
@@ -99,6 +162,7 @@ async def create_news_type(session: AsyncSession, type: str) -> NewsType | None:
     news_type = NewsType(type=type)
     session.add(news_type)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(news_type)
 
     return news_type
@@ -130,6 +194,7 @@ async def update_news_type(
 
     news_type.type = type_name
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(news_type)
     return news_type
 
@@ -144,4 +209,5 @@ async def delete_news_type(
 
     await session.delete(news_type)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     return True
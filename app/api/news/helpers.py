@@ -0,0 +1,13 @@
+from typing import Any, Sequence
+
+from api.helpers import encode_cursor
+
+
+def cut_page(items: Sequence[Any], limit: int) -> tuple[list[Any], str | None]:
+    # В crud запрашивается limit + 1 запись, лишняя говорит о наличии следующей страницы
+    if len(items) <= limit:
+        return list(items), None
+
+    page = list(items[:limit])
+    last = page[-1]
+    return page, encode_cursor(last.news_date, last.id)
@@ -2,7 +2,9 @@ from typing import Annotated
 import uuid
 from datetime import date
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+
+from core.image.service import image_service
 
 
 class NewsBase(BaseModel):
@@ -18,11 +20,22 @@ class NewsBase(BaseModel):
 class NewsFullResponse(NewsBase):
     id: uuid.UUID
 
+    @computed_field
+    @property
+    def image_srcset(self) -> dict[str, dict[int, str]]:
+        return image_service.get_srcset(self.image_url)
+
 
 class NewsPreviewResponse(BaseModel):
     id: uuid.UUID
     image_url: str
     min_text: str
+    news_date: date
+
+    @computed_field
+    @property
+    def image_srcset(self) -> dict[str, dict[int, str]]:
+        return image_service.get_srcset(self.image_url)
 
 
 class NewsTypeBase(BaseModel):
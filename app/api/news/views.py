@@ -2,14 +2,27 @@ from typing import Annotated
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Form, UploadFile, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Form,
+    UploadFile,
+    HTTPException,
+    status,
+    Query,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
+from core.config import settings
+from core.models import News, NewsType
 from core.db_helper import db_helper
 from core.file.service import file_service, NEWS_FOLDER
-from api.dependencies import get_current_active_user
-from api.helpers import parse_str_to_date
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag
+from api.auth.schemas import TokenUser
+from api.helpers import parse_str_to_date, decode_cursor, rows_response
+from api.news.helpers import cut_page
 from api.news.schemas import (
     NewsFullResponse,
     NewsPreviewResponse,
@@ -18,33 +31,62 @@ from api.news.schemas import (
 )
 from api.news import crud
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
-@router.get("/", response_model=list[NewsFullResponse])
+@router.get(
+    "/",
+    response_model=list[NewsFullResponse],
+    dependencies=[Depends(collection_etag(News))],
+)
 async def get_news(
+    response: Response,
+    limit: int = Query(crud.NEWS_PAGE_SIZE, ge=1, le=crud.NEWS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    type_id: uuid.UUID | None = None,
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    news = await crud.get_news(session=session)
+    news = await crud.get_news(
+        session=session,
+        limit=limit + 1,
+        after=decode_cursor(cursor) if cursor else None,
+        type_id=type_id,
+    )
+    news, next_cursor = cut_page(news, limit)
+    if next_cursor:
+        response.headers[settings.header.next_cursor_header] = next_cursor
+
     return news
 
 
-@router.get("/preview/", response_model=list[NewsPreviewResponse])
+@router.get(
+    "/preview/",
+    response_model=list[NewsPreviewResponse],
+    dependencies=[Depends(collection_etag(News))],
+)
 async def get_news_preview(
+    response: Response,
+    limit: int = Query(crud.NEWS_PAGE_SIZE, ge=1, le=crud.NEWS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    type_id: uuid.UUID | None = None,
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    news = await crud.get_news(session=session)
-    news_preview = []
-    for news_item in news:
-        news_preview.append(
-            NewsPreviewResponse(
-                id=news_item.id,
-                image_url=news_item.image_url,
-                min_text=news_item.min_text,
-            )
-        )
-
-    return news_preview
+    news = await crud.get_news_preview(
+        session=session,
+        limit=limit + 1,
+        after=decode_cursor(cursor) if cursor else None,
+        type_id=type_id,
+    )
+    news, next_cursor = cut_page(news, limit)
+    if next_cursor:
+        response.headers[settings.header.next_cursor_header] = next_cursor
+
+    # Ответ собирается вручную, поэтому переносим заголовки (ETag и курсор) сами
+    return rows_response(
+        news,
+        headers=dict(response.headers),
+        image_field="image_url",
+    )
 
 
 @router.post("/", response_model=NewsFullResponse)
@@ -56,11 +98,11 @@ async def create_news(
     news_date: Annotated[str, Form()],
     type_id: Annotated[uuid.UUID, Form()],
     keywords: Annotated[list[str], Form()],
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     news_date = parse_str_to_date(news_date)
-    image_url = await file_service.save_upload_file(
+    image_url = await file_service.save_image_file(
         upload_file=image, subdirectory=NEWS_FOLDER
     )
     news = await crud.create_news(
@@ -87,7 +129,7 @@ async def update_news(
     min_text: Annotated[str | None, Form()] = None,
     news_date: Annotated[str | None, Form()] = None,
     type_id: Annotated[uuid.UUID | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     news_date = parse_str_to_date(news_date) if news_date else None
@@ -98,11 +140,12 @@ async def update_news(
             detail="News not found",
         )
 
+    image_url = None
     if image:
-        await file_service.delete_file(current_news.image_url)
-        image_url = await file_service.save_upload_file(
+        image_url = await file_service.save_image_file(
             upload_file=image, subdirectory=NEWS_FOLDER
         )
+        await file_service.delete_file(current_news.image_url)
 
     news = await crud.update_news(
         session=session,
@@ -122,7 +165,7 @@ async def update_news(
 @router.delete("/{news_id}/")
 async def delete_news(
     news_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_news(session=session, news_id=news_id)
@@ -143,7 +186,11 @@ async def delete_news(
 # ====================
 
 
-@router.get("/types/", response_model=list[NewsTypeResponse])
+@router.get(
+    "/types/",
+    response_model=list[NewsTypeResponse],
+    dependencies=[Depends(collection_etag(NewsType))],
+)
 async def get_news_types(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
@@ -153,7 +200,7 @@ async def get_news_types(
 @router.post("/types/", response_model=NewsTypeResponse)
 async def create_news_type(
     type_in: NewsTypeCreate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     news_type = await crud.create_news_type(session=session, type=type_in.type)
@@ -169,7 +216,7 @@ async def create_news_type(
 async def update_news_type(
     type_id: uuid.UUID,
     type_in: NewsTypeCreate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     news_type = await crud.update_news_type(
@@ -186,7 +233,7 @@ async def update_news_type(
 @router.delete("/types/{type_id}/")
 async def delete_news_type(
     type_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_news_type(session=session, type_id=type_id)
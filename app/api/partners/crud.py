@@ -4,6 +4,9 @@ from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Partner
+from core.cache.service import cache_service
+
+CACHE_TAG = "partners"
 
 
 async def get_partners(session: AsyncSession) -> list[Partner]:
@@ -40,6 +43,7 @@ async def create_partner(
 
     session.add(partner)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(partner)
 
     return partner
@@ -55,6 +59,7 @@ async def update_partner(
             setattr(current_partner, field, value)
 
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{current_partner.id}")
     await session.refresh(current_partner)
 
     return current_partner
@@ -70,5 +75,6 @@ async def delete_partner(
 
     await session.delete(partner)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{partner_id}")
 
     return True
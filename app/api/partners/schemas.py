@@ -1,6 +1,8 @@
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+from core.image.service import image_service
 
 
 class PartnerResponse(BaseModel):
@@ -9,3 +11,8 @@ class PartnerResponse(BaseModel):
     partner_name: str
     partner_url: str | None = None
     count_order: int
+
+    @computed_field
+    @property
+    def logo_srcset(self) -> dict[str, dict[int, str]]:
+        return image_service.get_srcset(self.logo_url)
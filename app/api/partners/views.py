@@ -4,17 +4,23 @@ import uuid
 from fastapi import APIRouter, UploadFile, Form, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
+from core.models import Partner
 from core.db_helper import db_helper
 from core.file.service import file_service, PARTNERS_FOLDER
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.partners.schemas import PartnerResponse
 from api.partners import crud
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
-@router.get("/", response_model=list[PartnerResponse])
+@router.get(
+    "/",
+    response_model=list[PartnerResponse],
+    dependencies=[Depends(collection_etag(Partner))],
+)
 async def get_partners(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
@@ -22,7 +28,11 @@ async def get_partners(
     return partners
 
 
-@router.get("/{partner_id}/", response_model=PartnerResponse)
+@router.get(
+    "/{partner_id}/",
+    response_model=PartnerResponse,
+    dependencies=[Depends(entity_etag(Partner, "partner_id"))],
+)
 async def get_partner_by_id(
     partner_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -44,10 +54,10 @@ async def create_partner(
     partner_name: Annotated[str, Form()],
     count_order: Annotated[int, Form(ge=1)],
     partner_url: Annotated[str | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    logo_url = await file_service.save_upload_file(
+    logo_url = await file_service.save_image_file(
         upload_file=logo,
         subdirectory=PARTNERS_FOLDER,
     )
@@ -69,7 +79,7 @@ async def update_partner(
     partner_name: Annotated[str | None, Form()] = None,
     count_order: Annotated[int | None, Form(ge=1)] = None,
     partner_url: Annotated[str | None, Form()] = None,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     current_partner = await crud.get_partner_by_id(
@@ -81,11 +91,12 @@ async def update_partner(
             detail="Partner not found",
         )
 
+    logo_url = None
     if logo:
-        await file_service.delete_file(current_partner.logo_url)
-        logo_url = await file_service.save_upload_file(
+        logo_url = await file_service.save_image_file(
             upload_file=logo, subdirectory=PARTNERS_FOLDER
         )
+        await file_service.delete_file(current_partner.logo_url)
 
     partner = await crud.update_partner(
         session=session,
@@ -102,7 +113,7 @@ async def update_partner(
 @router.delete("/{partner_id}/")
 async def delete_partner(
     partner_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_partner(session=session, partner_id=partner_id)
@@ -4,8 +4,11 @@ from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Poll
+from core.cache.service import cache_service
 from api.polls.schemas import PollCreate, PollUpdate
 
+CACHE_TAG = "polls"
+
 
 async def get_polls(session: AsyncSession) -> list[Poll]:
     stmt = select(Poll).order_by(desc(Poll.created_at))
@@ -32,6 +35,7 @@ async def create_poll(
     poll = Poll(**poll_in.model_dump())
     session.add(poll)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(poll)
 
     return poll
@@ -51,6 +55,7 @@ async def update_poll(
         setattr(poll, field, value)
 
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{poll_id}")
     await session.refresh(poll)
 
     return poll
@@ -66,5 +71,6 @@ async def delete_poll(
 
     await session.delete(poll)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{poll_id}")
 
     return True
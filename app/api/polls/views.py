@@ -3,16 +3,22 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
+from core.models import Poll
 from core.db_helper import db_helper
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.polls.schemas import PollResponse, PollCreate, PollUpdate
 from api.polls import crud
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
-@router.get("/", response_model=list[PollResponse])
+@router.get(
+    "/",
+    response_model=list[PollResponse],
+    dependencies=[Depends(collection_etag(Poll))],
+)
 async def get_polls(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
@@ -20,7 +26,11 @@ async def get_polls(
     return polls
 
 
-@router.get("/{poll_id}/", response_model=PollResponse)
+@router.get(
+    "/{poll_id}/",
+    response_model=PollResponse,
+    dependencies=[Depends(entity_etag(Poll, "poll_id"))],
+)
 async def get_poll_by_id(
     poll_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -38,7 +48,7 @@ async def get_poll_by_id(
 @router.post("/", response_model=PollResponse)
 async def create_poll(
     poll_in: PollCreate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     poll = await crud.create_poll(session=session, poll_in=poll_in)
@@ -49,7 +59,7 @@ async def create_poll(
 async def update_poll(
     poll_id: uuid.UUID,
     poll_in: PollUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     poll = await crud.update_poll(
@@ -70,7 +80,7 @@ async def update_poll(
 @router.delete("/{poll_id}/")
 async def delete_poll(
     poll_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_poll(session=session, poll_id=poll_id)
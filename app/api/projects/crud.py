@@ -4,8 +4,13 @@ from sqlalchemy import select, delete, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import Project
+from core.cache.service import cache_service
+from core.models.search_document import PROJECT_ENTITY
+from core.search.documents import search_document_service
 from api.projects.schemas import ProjectCreate, ProjectUpdate
 
+CACHE_TAG = "projects"
+
 
 async def get_projects(
     session: AsyncSession,
@@ -34,7 +39,10 @@ async def create_project(
     project = Project(**project_in.model_dump())
     session.add(project)
 
+    await session.flush()
+    await search_document_service.save_project(session=session, project=project)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG)
     await session.refresh(project)
 
     return project
@@ -54,7 +62,9 @@ async def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
 
+    await search_document_service.save_project(session=session, project=project)
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{project_id}")
     await session.refresh(project)
 
     return project
@@ -69,6 +79,10 @@ async def delete_project(
         return False
 
     await session.delete(project)
+    await search_document_service.delete(
+        session=session, entity_type=PROJECT_ENTITY, entity_id=project_id
+    )
     await session.commit()
+    await cache_service.invalidate(CACHE_TAG, f"{CACHE_TAG}:{project_id}")
 
     return True
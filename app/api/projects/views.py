@@ -3,17 +3,23 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
+from core.models import Project
 from core.db_helper import db_helper
-from api.dependencies import get_current_active_user
+from core.cache.service import cached_route
+from api.dependencies import get_current_active_user, collection_etag, entity_etag
+from api.auth.schemas import TokenUser
 from api.projects.schemas import ProjectResponse, ProjectCreate, ProjectUpdate
 from api.projects import crud
 
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route(crud.CACHE_TAG))
 
 
-@router.get("/", response_model=list[ProjectResponse])
+@router.get(
+    "/",
+    response_model=list[ProjectResponse],
+    dependencies=[Depends(collection_etag(Project))],
+)
 async def get_projects(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
@@ -22,7 +28,11 @@ async def get_projects(
     return projects
 
 
-@router.get("/{project_id}/", response_model=ProjectResponse)
+@router.get(
+    "/{project_id}/",
+    response_model=ProjectResponse,
+    dependencies=[Depends(entity_etag(Project, "project_id"))],
+)
 async def get_project_by_id(
     project_id: uuid.UUID,
     session: AsyncSession = Depends(db_helper.session_getter),
@@ -40,7 +50,7 @@ async def get_project_by_id(
 @router.post("/", response_model=ProjectResponse)
 async def create_project(
     project_in: ProjectCreate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     project = await crud.create_project(session=session, project_in=project_in)
@@ -51,7 +61,7 @@ async def create_project(
 async def update_project(
     project_id: uuid.UUID,
     project_in: ProjectUpdate,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     project = await crud.update_project(
@@ -69,7 +79,7 @@ async def update_project(
 @router.delete("/{project_id}/")
 async def delete_project(
     project_id: uuid.UUID,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_project(session=session, project_id=project_id)
@@ -1,68 +1,224 @@
-from sqlalchemy import select, or_, desc
-from sqlalchemy.orm import joinedload
+from typing import Sequence
+
+from sqlalchemy import (
+    Row,
+    Select,
+    select,
+    desc,
+    func,
+    literal,
+    or_,
+    exists,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import (
+    websearch_to_tsquery,
+    ts_headline,
+    aggregate_order_by,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import News
+from core.config import settings
+from core.models import News, SearchDocument
+from core.search.documents import TS_CONFIG
+from api.news.crud import NEWS_PREVIEW_COLUMNS
+
+SNIPPET_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=10"
+)
 
 
-async def get_suggestions(
+async def search_all(
     session: AsyncSession,
     query: str,
-    limit: int = 5,
-) -> list[str]:
-    stmt = (
-        select(News)
+    entity_type: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+) -> tuple[list[dict], dict[str, int]]:
+    ts_query = websearch_to_tsquery(TS_CONFIG, query)
+
+    # CTE используется дважды, поэтому Postgres материализует его:
+    # одно сканирование GIN индекса и для выдачи, и для подсчета фасетов
+    matched = (
+        select(
+            SearchDocument.entity_type,
+            SearchDocument.entity_id,
+            SearchDocument.title,
+            SearchDocument.published_at,
+            func.ts_rank_cd(SearchDocument.search_vector, ts_query).label("rank"),
+        )
         .where(
-            or_(
-                News.title.ilike(f"%{query}%"),
-                News.keywords.any(query),
+            SearchDocument.is_active.is_(True),
+            SearchDocument.search_vector.bool_op("@@")(ts_query),
+        )
+        .cte("matched")
+    )
+
+    page = select(matched).order_by(desc(matched.c.rank), desc(matched.c.published_at))
+    if entity_type:
+        page = page.where(matched.c.entity_type == entity_type)
+    page = page.limit(limit).offset(skip).subquery("page")
+
+    facet_counts = (
+        select(matched.c.entity_type, func.count().label("total"))
+        .group_by(matched.c.entity_type)
+        .subquery("facet_counts")
+    )
+
+    stmt = select(
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    page.table_valued(), desc(page.c.rank), desc(page.c.published_at)
+                )
             )
         )
-        .limit(limit * 3)
-        .order_by(desc(News.news_date))
+        .select_from(page)
+        .scalar_subquery(),
+        select(func.json_object_agg(facet_counts.c.entity_type, facet_counts.c.total))
+        .select_from(facet_counts)
+        .scalar_subquery(),
     )
 
-    result = await session.scalars(stmt)
-    news_items = result.all()
-    suggestions = set()
+    result = await session.execute(stmt)
+    items, facets = result.one()
+    return items or [], facets or {}
 
-    for news in news_items:
-        # Добавляем заголовок если совпадает
-        if query.lower() in news.title.lower():
-            suggestions.add(news.title)
 
-        # Добавляем подходящие keywords
-        for keyword in news.keywords:
-            if query.lower() in keyword.lower():
-                suggestions.add(keyword)
+async def search_news(
+    session: AsyncSession,
+    query: str,
+    limit: int = 10,
+    skip: int = 0,
+    with_snippets: bool = False,
+) -> Sequence[Row]:
+    ts_query = websearch_to_tsquery(TS_CONFIG, query)
+    rank = func.ts_rank_cd(News.search_vector, ts_query)
+    is_matched = News.search_vector.bool_op("@@")(ts_query)
 
-        # Ограничиваем количество
-        if len(suggestions) >= limit:
-            break
+    stmt = (
+        select(*NEWS_PREVIEW_COLUMNS)
+        .where(is_matched)
+        .order_by(desc(rank), desc(News.news_date))
+        .limit(limit)
+        .offset(skip)
+    )
+    if with_snippets:
+        stmt = _add_snippets(
+            stmt=stmt.add_columns(rank.label("rank")), ts_query=ts_query
+        )
 
-    return list(suggestions)[:limit]
+    result = await session.execute(stmt)
+    news = result.all()
+    if news or (skip and await session.scalar(select(exists().where(is_matched)))):
+        return news
 
+    # Полнотекстовый поиск ничего не нашел - вероятно опечатка, ищем по триграммам
+    return await search_similar_news(
+        session=session,
+        query=query,
+        limit=limit,
+        skip=skip,
+    )
 
-async def search_news(
+
+async def search_similar_news(
     session: AsyncSession,
     query: str,
     limit: int = 10,
     skip: int = 0,
-) -> list[News]:
+) -> Sequence[Row]:
+    await _set_similarity_threshold(session=session)
+
+    keywords = func.news_keywords_text(News.keywords)
+    score = func.greatest(
+        func.word_similarity(query, News.title),
+        func.word_similarity(query, keywords),
+    )
+
     stmt = (
-        select(News)
-        .options(joinedload(News.type))
+        select(*NEWS_PREVIEW_COLUMNS)
         .where(
             or_(
-                News.title.ilike(f"%{query}%"),
-                News.keywords.any(query),
-                News.min_text.ilike(f"%{query}%"),
+                literal(query).op("<%")(News.title),
+                literal(query).op("<%")(keywords),
             )
         )
+        .order_by(desc(score), desc(News.news_date))
         .limit(limit)
         .offset(skip)
-        .order_by(desc(News.news_date))
+    )
+
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def get_similar_suggestions(
+    session: AsyncSession,
+    query: str,
+    limit: int = 5,
+) -> list[str]:
+    await _set_similarity_threshold(session=session)
+
+    # unnest в FROM: каждое ключевое слово проверяется отдельно, иначе одно
+    # совпадение в статье возвращало бы все ее ключевые слова
+    keyword = func.unnest(News.keywords).column_valued("keyword")
+    titles = select(
+        News.title.label("term"),
+        func.word_similarity(query, News.title).label("score"),
+    ).where(literal(query).op("<%")(News.title))
+    keywords = (
+        select(
+            keyword.label("term"),
+            func.word_similarity(query, keyword).label("score"),
+        )
+        .select_from(News)
+        .where(
+            # Первое условие отбирает статьи по индексу, второе - сами слова
+            literal(query).op("<%")(func.news_keywords_text(News.keywords)),
+            literal(query).op("<%")(keyword),
+        )
+    )
+    terms = union_all(titles, keywords).subquery()
+
+    stmt = (
+        select(terms.c.term)
+        .group_by(terms.c.term)
+        .order_by(desc(func.max(terms.c.score)))
+        .limit(limit)
     )
 
     result = await session.scalars(stmt)
     return list(result.all())
+
+
+def _add_snippets(stmt: Select, ts_query) -> Select:
+    # ts_headline дорогой, поэтому считаем его только для строк текущей страницы
+    ranked = stmt.cte("ranked")
+    snippet = ts_headline(
+        TS_CONFIG,
+        func.regexp_replace(News.body, "<[^>]*>", " ", "g"),
+        ts_query,
+        SNIPPET_OPTIONS,
+    )
+
+    return (
+        select(
+            *(ranked.c[column.key] for column in NEWS_PREVIEW_COLUMNS),
+            snippet.label("snippet"),
+        )
+        .join(News, News.id == ranked.c.id)
+        .order_by(desc(ranked.c.rank), desc(ranked.c.news_date))
+    )
+
+
+async def _set_similarity_threshold(session: AsyncSession):
+    # Порог действует только в рамках текущей транзакции
+    stmt = select(
+        func.set_config(
+            "pg_trgm.word_similarity_threshold",
+            str(settings.search.similarity_threshold),
+            True,
+        )
+    )
+    await session.execute(stmt)
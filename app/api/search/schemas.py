@@ -1,5 +1,5 @@
 import uuid
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -9,3 +9,18 @@ class NewsResponseSearch(BaseModel):
     image_url: str
     min_text: str
     news_date: date
+    snippet: str | None = None
+    image_srcset: dict[str, dict[int, str]] = {}
+
+
+class SearchDocumentResponse(BaseModel):
+    entity_type: str
+    entity_id: uuid.UUID
+    title: str
+    published_at: datetime
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchDocumentResponse]
+    facets: dict[str, int]
@@ -2,19 +2,48 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db_helper import db_helper
+from core.search.service import suggestion_service
+from api.helpers import rows_response
 from api.search import crud
-from api.search.schemas import NewsResponseSearch
+from api.search.schemas import NewsResponseSearch, SearchResponse
 
 router = APIRouter()
 
 
+@router.get("/", response_model=SearchResponse)
+async def search(
+    query: str = Query(min_length=1),
+    entity_type: str | None = None,
+    limit: int = Query(10, ge=1, le=50),
+    skip: int = Query(0, ge=0),
+    session: AsyncSession = Depends(db_helper.session_getter),
+):
+    items, facets = await crud.search_all(
+        session=session,
+        query=query,
+        entity_type=entity_type,
+        limit=limit,
+        skip=skip,
+    )
+
+    return SearchResponse(items=items, facets=facets)
+
+
 @router.get("/news/suggestions/")
 async def get_news_suggestions(
     query: str = Query(min_length=1),
     limit: int = Query(5, ge=1, le=10),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    suggestions = await crud.get_suggestions(session=session, query=query, limit=limit)
+    suggestions = suggestion_service.suggest(query=query, limit=limit)
+    if not suggestions:
+        # По префиксу ничего нет, пробуем нечеткое совпадение (опечатки)
+        suggestions = await crud.get_similar_suggestions(
+            session=session,
+            query=query,
+            limit=limit,
+        )
+
     return {"suggestions": suggestions}
 
 
@@ -23,6 +52,7 @@ async def get_news_by_query(
     query: str = Query(min_length=1),
     limit: int = Query(5, ge=1),
     skip: int = Query(0, ge=0),
+    snippets: bool = False,
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     news_items = await crud.search_news(
@@ -30,15 +60,7 @@ async def get_news_by_query(
         query=query,
         limit=limit,
         skip=skip,
+        with_snippets=snippets,
     )
 
-    # Преобразуем в схему ответа
-    return [
-        NewsResponseSearch(
-            id=news.id,
-            image_url=news.image_url,
-            min_text=news.min_text,
-            news_date=news.news_date,
-        )
-        for news in news_items
-    ]
+    return rows_response(news_items, image_field="image_url")
@@ -3,11 +3,11 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import User
 from core.db_helper import db_helper
 from core.email.service import email_service
 from security import utils as security_utils
 from api.dependencies import get_current_active_user
+from api.auth.schemas import TokenUser
 from api.subscribers.schemas import (
     SubscriberResponse,
     SubscriberCreate,
@@ -21,7 +21,7 @@ router = APIRouter()
 
 @router.get("/", response_model=list[SubscriberResponse])
 async def get_subscribers(
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     subscriber = await crud.get_subscribers(session=session)
@@ -89,7 +89,7 @@ async def delete_subscriber(
 async def start_mailing_by_news_type(
     type_id: uuid.UUID,
     news_letter: NewsLetter,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     subscribers = await crud.get_subscribers_by_news_type_id(
@@ -4,13 +4,18 @@ from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import User
+from core.auth.service import token_version_service, user_cache_service
+from core.password.service import password_service
 from api.auth.schemas import UserRegister
 from api.users.schemas import UserUpdate
 from api.users.helpers import is_valid_email
 
 
 async def create_user(session: AsyncSession, user_in: UserRegister) -> User:
-    user = User(**user_in.model_dump())
+    user = User(
+        **user_in.model_dump(exclude={"password"}),
+        hashed_password=await password_service.hash_password(user_in.password),
+    )
     session.add(user)
     await session.commit()
     # await session.refresh(user) # Не нужно обновлять юзера, т.к. данные нужные уже есть
@@ -30,7 +35,7 @@ async def get_user_and_validate_password(
     if not user:
         return None
 
-    if not user.check_password(password):
+    if not await user.check_password(password):
         return None
 
     return user
@@ -97,7 +102,10 @@ async def deactivate_user(
         return False
 
     user.is_active = False
+    user.token_version += 1
     await session.commit()
+    token_version_service.set_version(user.id, user.token_version)
+    user_cache_service.invalidate(user.id)
     return True
 
 
@@ -111,6 +119,7 @@ async def activate_user(
 
     user.is_active = True
     await session.commit()
+    user_cache_service.invalidate(user.id)
     return True
 
 
@@ -130,6 +139,7 @@ async def update_user(
 
     await session.commit()
     await session.refresh(user)
+    user_cache_service.invalidate(user.id)
     return user
 
 
@@ -143,5 +153,22 @@ async def delete_user(
 
     await session.delete(user)
     await session.commit()
+    token_version_service.set_version(user_id, None)
+    user_cache_service.invalidate(user_id)
+
+    return True
+
+
+async def revoke_access_tokens(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+) -> bool:
+    user = await get_user_by_id(session=session, user_id=user_id)
+    if not user:
+        return False
 
+    user.token_version += 1
+    await session.commit()
+    token_version_service.set_version(user.id, user.token_version)
+    user_cache_service.invalidate(user.id)
     return True
@@ -6,7 +6,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import User
 from core.db_helper import db_helper
-from api.dependencies import get_current_active_user, get_current_admin
+from core.auth.service import user_cache_service
+from api.dependencies import (
+    get_current_user,
+    get_current_active_user,
+    get_current_admin,
+)
+from api.auth.schemas import TokenUser
 from api.users import crud
 from api.users.schemas import UserResponse, UserResponseForAdmin, UserUpdate
 from api.auth.schemas import UserChangePassword
@@ -18,7 +24,7 @@ router = APIRouter()
 
 @router.get("/me/", response_model=UserResponse)
 async def get_user_info(
-    user: User = Depends(get_current_active_user),
+    user: User = Depends(get_current_user),
 ):
     return user
 
@@ -26,7 +32,7 @@ async def get_user_info(
 @router.patch("/me/", response_model=UserResponse)
 async def update_user(
     user_update: UserUpdate,
-    user: User = Depends(get_current_active_user),
+    user: User = Depends(get_current_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     user = await crud.update_user(session=session, user_update=user_update)
@@ -36,10 +42,9 @@ async def update_user(
 @router.get("/{user_id}/", response_model=UserResponseForAdmin)
 async def get_user_by_id(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
-    session: AsyncSession = Depends(db_helper.session_getter),
+    admin: TokenUser = Depends(get_current_admin),
 ):
-    user = await crud.get_user_by_id(session=session, user_id=user_id)
+    user = await user_cache_service.get_user(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,7 +59,7 @@ async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=0),
     is_active: bool | None = None,
-    admin: User = Depends(get_current_admin),
+    admin: TokenUser = Depends(get_current_admin),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     users = await crud.get_users(
@@ -66,7 +71,7 @@ async def get_users(
 @router.delete("/{user_id}/deactivate/")
 async def deactivate_user(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
+    admin: TokenUser = Depends(get_current_admin),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deactivated = await crud.deactivate_user(session=session, user_id=user_id)
@@ -82,7 +87,7 @@ async def deactivate_user(
 @router.patch("/{user_id}/activate/")
 async def activate_user(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
+    admin: TokenUser = Depends(get_current_admin),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_activated = await crud.activate_user(session=session, user_id=user_id)
@@ -98,7 +103,7 @@ async def activate_user(
 @router.post("/change-password/", response_model=UserResponse)
 async def change_user_password(
     user_in: UserChangePassword,
-    user: User = Depends(get_current_active_user),
+    user: TokenUser = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     try:
@@ -119,7 +124,7 @@ async def change_user_password(
 @router.delete("/{user_id}/delete/")
 async def delete_user(
     user_id: uuid.UUID,
-    admin: User = Depends(get_current_admin),
+    admin: TokenUser = Depends(get_current_admin),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     is_deleted = await crud.delete_user(session=session, user_id=user_id)
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import os
+from pathlib import PurePosixPath
+
+from core.config import settings
+from core.file.service import IMAGES_FOLDER
+from core.image.service import SAVE_FORMATS, image_service, is_derivative
+from core.storage.service import storage_backend
+
+
+def is_original_image(path: str) -> bool:
+    image_path = PurePosixPath(path)
+    return (
+        path.startswith(f"{IMAGES_FOLDER}/")
+        and image_path.suffix.lower() in SAVE_FORMATS
+        and not is_derivative(image_path)
+    )
+
+
+async def has_derivatives(path: str) -> bool:
+    for derivatives in image_service.get_derivative_paths(path).values():
+        for derivative in derivatives.values():
+            if not await storage_backend.exists(derivative):
+                return False
+
+    return True
+
+
+async def backfill_images(workers: int, force: bool) -> tuple[int, int]:
+    # Копии создаются в пуле процессов ImageService, семафор ограничивает
+    # число изображений в работе одновременно
+    semaphore = asyncio.Semaphore(workers)
+    processed = 0
+    failed = 0
+
+    async def process(path: str):
+        nonlocal processed, failed
+        async with semaphore:
+            # Пропускаем изображения, для которых все копии уже созданы
+            if not force and await has_derivatives(path):
+                return
+
+            if await image_service.create_derivatives(path):
+                processed += 1
+            else:
+                failed += 1
+                print(f"Failed {path}")
+
+    async for files in storage_backend.list_files(
+        exclude=lambda path: not is_original_image(path),
+    ):
+        await asyncio.gather(*(process(file.path) for file in files))
+
+    await image_service.close()
+    await storage_backend.close()
+    return processed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Создание уменьшенных копий для уже загруженных изображений",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.image.max_workers or os.cpu_count(),
+    )
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    processed, failed = asyncio.run(backfill_images(args.workers, args.force))
+    print(f"Done: {processed}, failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-import datetime
+import asyncio
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import delete, and_
+from sqlalchemy import delete, func
 
 from core.db_helper import db_helper
 from core.models import RefreshToken
@@ -10,12 +10,8 @@ from core.models import RefreshToken
 async def cleanup_tokens():
     try:
         async with db_helper.session_factory() as session:
-            stmt = delete(RefreshToken).where(
-                and_(
-                    RefreshToken.expires_at.is_not(None),
-                    RefreshToken.expires_at < datetime.now(),
-                )
-            )
+            # Истекшие токены находятся по индексу ix_refresh_tokens_expires_at
+            stmt = delete(RefreshToken).where(RefreshToken.expires_at < func.now())
 
             result = await session.execute(stmt)
             await session.commit()
@@ -25,9 +21,7 @@ async def cleanup_tokens():
             return deleted_count
 
     except Exception:
-        if session:
-            await session.rollback()
-        return 0
+        return 0  # Транзакция откатывается при закрытии сессии
 
 
 async def setup_cleanup_tokens():
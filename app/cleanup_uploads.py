@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import delete, select, union_all
+
+from core.config import settings
+from core.db_helper import db_helper
+from core.file.service import file_service
+from core.image.service import image_service
+from core.models import Banner, Document, Event, News, Partner, StoredFile
+from core.storage.service import storage_backend
+
+MAX_REPORTED_PATHS = 100
+
+
+@dataclass
+class UploadsCleanupReport:
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    paths: list[str] = field(default_factory=list)  # Первые найденные файлы
+
+
+def hash_path(path: str) -> bytes:
+    # В памяти держим 8-байтовые хеши путей, а не сами строки
+    return hashlib.blake2b(path.encode(), digest_size=8).digest()
+
+
+async def get_referenced_paths() -> set[bytes]:
+    stmt = union_all(
+        select(Banner.image_url),
+        select(Event.image_url),
+        select(News.image_url),
+        select(Partner.logo_url),
+        select(Document.file_url),
+    )
+
+    referenced = set()
+    async with db_helper.session_factory() as session:
+        result = await session.stream_scalars(
+            stmt.execution_options(yield_per=settings.file.gc_batch_size)
+        )
+        async for path in result:
+            if not path:
+                continue
+
+            referenced.add(hash_path(path))
+            # Сжатые и уменьшенные копии живут, пока есть ссылка на оригинал
+            referenced.update(
+                hash_path(item) for item in file_service.get_compressed_paths(path)
+            )
+            for derivatives in image_service.get_derivative_paths(path).values():
+                referenced.update(hash_path(item) for item in derivatives.values())
+
+    return referenced
+
+
+async def remove_orphaned_files(paths: list[str], older_than: datetime):
+    # При хранении по хешу счетчики ссылок блокируются до удаления файлов.
+    # Повторная загрузка того же содержимого после сканирования обновляет
+    # updated_at, такие файлы пропускаем, а загрузка ждет коммита
+    async with db_helper.session_factory() as session:
+        stmt = (
+            select(StoredFile.path, StoredFile.updated_at)
+            .where(StoredFile.path.in_(paths))
+            .with_for_update()
+        )
+        stored_files = dict((await session.execute(stmt)).all())
+        for path in paths:
+            if path not in stored_files or stored_files[path] < older_than:
+                await storage_backend.delete(path)
+            else:
+                del stored_files[path]
+
+        await session.execute(
+            delete(StoredFile).where(StoredFile.path.in_(list(stored_files)))
+        )
+        await session.commit()
+
+
+async def cleanup_uploads(dry_run: bool = False) -> UploadsCleanupReport:
+    report = UploadsCleanupReport()
+
+    # Недавние файлы не трогаем: ссылка на них может быть еще не закоммичена
+    older_than = time.time() - settings.file.gc_grace_hours * 3600
+    referenced = await get_referenced_paths()
+
+    # Файлы перебираются пачками, размер и время изменения запрашиваются
+    # только для файлов без ссылок
+    async for files in storage_backend.list_files(
+        exclude=lambda path: hash_path(path) in referenced,
+    ):
+        orphans = [file for file in files if file.modified_at < older_than]
+        report.orphaned += len(orphans)
+        for file in orphans:
+            report.orphaned_bytes += file.size
+            if len(report.paths) < MAX_REPORTED_PATHS:
+                report.paths.append(file.path)
+
+        if orphans and not dry_run:
+            await remove_orphaned_files(
+                [file.path for file in orphans],
+                older_than=datetime.fromtimestamp(older_than, timezone.utc),
+            )
+
+    return report
+
+
+async def setup_cleanup_uploads():
+    try:
+        scheduler = AsyncIOScheduler()
+
+        scheduler.add_job(
+            cleanup_uploads,
+            trigger=CronTrigger(hour=4, minute=0),
+            id="uploads_cleanup",
+            replace_existing=True,
+        )
+
+        scheduler.start()
+
+        while True:
+            await asyncio.sleep(3600)
+
+    except Exception:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Удаление загруженных файлов, на которые нет ссылок в базе",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(cleanup_uploads(dry_run=args.dry_run))
+    for path in report.paths:
+        print(path)
+
+    action = "Would remove" if args.dry_run else "Removed"
+    print(f"{action}: {report.orphaned} files ({report.orphaned_bytes} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
 from core.models.user import User, ADMIN_ROLE
 from core.email.service import email_service
+from core.password.service import password_service
 from api.auth.helpers import create_jwt_without_type
 
 
@@ -23,7 +24,7 @@ class AdminService:
         admin = User(
             email=settings.admin.email,
             username=settings.admin.username,
-            password="adminadmin",
+            hashed_password=await password_service.hash_password("adminadmin"),
             role=ADMIN_ROLE,
             is_active=True,
         )
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.db_helper import db_helper
+from core.models import User
+
+
+class TokenVersionService:
+    # Access токен принимается, пока его claim "ver" совпадает с версией
+    # пользователя. Версии кэшируются в процессе, чтобы проверка токена
+    # обходилась без запроса к базе
+    def __init__(self, cache_seconds: int, cache_size: int):
+        self.cache_seconds = cache_seconds
+        self.cache_size = cache_size
+        # None - пользователь удален, такие ответы тоже кэшируются
+        self._versions: OrderedDict[uuid.UUID, tuple[int | None, float]] = OrderedDict()
+
+    async def get_version(self, user_id: uuid.UUID) -> int | None:
+        cached = self._versions.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            self._versions.move_to_end(user_id)
+            return cached[0]
+
+        async with db_helper.session_factory() as session:
+            version = await session.scalar(
+                select(User.token_version).where(User.id == user_id)
+            )
+
+        self.set_version(user_id, version)
+        return version
+
+    def set_version(self, user_id: uuid.UUID, version: int | None):
+        # Вызывается после коммита изменений, которые отзывают токены
+        self._versions[user_id] = (version, time.monotonic() + self.cache_seconds)
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > self.cache_size:
+            self._versions.popitem(last=False)
+
+
+class UserCacheService:
+    # Пользователи по id для эндпоинтов, которым нужна модель целиком.
+    # Объекты отсоединены от сессии и используются только для чтения:
+    # изменения делаются через users_crud, который сбрасывает запись
+    def __init__(
+        self,
+        cache_seconds: int,
+        negative_cache_seconds: int,
+        cache_size: int,
+    ):
+        self.cache_seconds = cache_seconds
+        self.negative_cache_seconds = negative_cache_seconds
+        self.cache_size = cache_size
+        self._users: OrderedDict[uuid.UUID, tuple[User | None, float]] = OrderedDict()
+        self._loading: dict[uuid.UUID, asyncio.Task] = {}
+
+    async def get_user(self, user_id: uuid.UUID | str) -> User | None:
+        user_id = uuid.UUID(str(user_id))
+        cached = self._users.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            self._users.move_to_end(user_id)
+            return cached[0]
+
+        # Одновременные промахи по одному пользователю ждут один запрос к базе
+        task = self._loading.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._load(user_id))
+            self._loading[user_id] = task
+            task.add_done_callback(
+                lambda done: self._finish_loading(user_id=user_id, task=done)
+            )
+
+        # shield: отмена одного запроса не прерывает загрузку для остальных
+        return await asyncio.shield(task)
+
+    async def _load(self, user_id: uuid.UUID) -> User | None:
+        async with db_helper.session_factory() as session:
+            user = await session.scalar(select(User).where(User.id == user_id))
+
+        # Если запись сбросили во время загрузки, результат мог устареть
+        if self._loading.get(user_id) is asyncio.current_task():
+            ttl = self.cache_seconds if user else self.negative_cache_seconds
+            self._users[user_id] = (user, time.monotonic() + ttl)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.cache_size:
+                self._users.popitem(last=False)
+
+        return user
+
+    def _finish_loading(self, user_id: uuid.UUID, task: asyncio.Task):
+        if self._loading.get(user_id) is task:
+            del self._loading[user_id]
+
+    def invalidate(self, user_id: uuid.UUID | str):
+        # Вызывается после коммита изменений пользователя
+        user_id = uuid.UUID(str(user_id))
+        self._users.pop(user_id, None)
+        self._loading.pop(user_id, None)
+
+
+class RevokedTokenService:
+    # jti refresh токенов, отозванных в этом воркере. Повторное использование
+    # такого токена отклоняется без запроса к базе, остальные проверяет база.
+    # Запись нужна только до истечения самого токена
+    def __init__(self, cache_size: int):
+        self.cache_size = cache_size
+        self._revoked: OrderedDict[uuid.UUID, float] = OrderedDict()
+
+    def is_revoked(self, jti: uuid.UUID | str) -> bool:
+        jti = uuid.UUID(str(jti))
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.time():
+            del self._revoked[jti]
+            return False
+
+        return True
+
+    def revoke(self, jti: uuid.UUID | str, expires_at: float):
+        # expires_at - Unix timestamp истечения токена
+        jti = uuid.UUID(str(jti))
+        self._revoked[jti] = expires_at
+        self._revoked.move_to_end(jti)
+        while len(self._revoked) > self.cache_size:
+            self._revoked.popitem(last=False)
+
+
+token_version_service = TokenVersionService(
+    cache_seconds=settings.auth.token_version_cache_seconds,
+    cache_size=settings.auth.token_version_cache_size,
+)
+user_cache_service = UserCacheService(
+    cache_seconds=settings.auth.user_cache_seconds,
+    negative_cache_seconds=settings.auth.user_negative_cache_seconds,
+    cache_size=settings.auth.user_cache_size,
+)
+revoked_token_service = RevokedTokenService(
+    cache_size=settings.auth.revoked_token_cache_size,
+)
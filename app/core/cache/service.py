@@ -0,0 +1,285 @@
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.helpers import is_not_modified
+
+CACHE_HEADER = "X-Cache"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    status_code: int
+    headers: dict[str, str]
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: CachedResponse, tags: set[str]): ...
+
+    @abstractmethod
+    async def invalidate(self, *tags: str): ...
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse, set[str]]] = (
+            OrderedDict()
+        )
+        self._tag_keys: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedResponse, tags: set[str]):
+        self._delete(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._delete(next(iter(self._entries)))
+
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            for key in self._tag_keys.pop(tag, set()):
+                self._delete(key)
+
+    def _delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return
+
+        for tag in entry[2]:
+            keys = self._tag_keys.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tag_keys[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    # Работает с любым сервером, совместимым с протоколом Redis.
+    # Ответ хранится в hash, ключи каждого тега - в отдельном set
+    def __init__(self, url: str, ttl: int, key_prefix: str):
+        self.redis = Redis.from_url(url)
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> CachedResponse | None:
+        try:
+            body, meta = await self.redis.hmget(self._key(key), "body", "meta")
+        except RedisError:
+            return None
+
+        if body is None or meta is None:
+            return None
+
+        meta = orjson.loads(meta)
+        return CachedResponse(
+            body=body,
+            status_code=meta["status_code"],
+            headers=meta["headers"],
+        )
+
+    async def set(self, key: str, value: CachedResponse, tags: set[str]):
+        meta = orjson.dumps(
+            {"status_code": value.status_code, "headers": value.headers}
+        )
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._key(key), mapping={"body": value.body, "meta": meta})
+                pipe.expire(self._key(key), self.ttl)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), self._key(key))
+                    pipe.expire(self._tag_key(tag), self.ttl)
+                await pipe.execute()
+        except RedisError:
+            pass  # Кэш не должен ломать ответ
+
+    async def invalidate(self, *tags: str):
+        try:
+            for tag in tags:
+                keys = await self.redis.smembers(self._tag_key(tag))
+                await self.redis.delete(self._tag_key(tag), *keys)
+        except RedisError:
+            pass  # Запись все равно устареет по TTL
+
+    async def close(self):
+        await self.redis.aclose()
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}response:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}tag:{tag}"
+
+
+class CacheService:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> CachedResponse | None:
+        value = await self.backend.get(key)
+        if value:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return value
+
+    async def set(self, key: str, value: CachedResponse, tags: set[str]):
+        await self.backend.set(key, value, tags)
+
+    async def invalidate(self, *tags: str):
+        await self.backend.invalidate(*tags)
+
+    async def close(self):
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+
+def cached_route(*tags: str) -> type[APIRoute]:
+    # Класс маршрута для публичных GET эндпоинтов: ответ кэшируется целиком
+    # с тегами роутера, а ответы по конкретной сущности с тегами "tag:id"
+    class CachedRoute(APIRoute):
+        def get_route_handler(self):
+            handler = super().get_route_handler()
+            if "GET" not in self.methods:
+                return handler
+
+            async def cached_handler(request: Request) -> Response:
+                if "authorization" in request.headers:
+                    return await handler(request)
+
+                key = cache_service.make_key(request)
+                cached = await cache_service.get(key)
+                if cached:
+                    etag = cached.headers.get("etag")
+                    if etag and is_not_modified(
+                        request=request,
+                        etag=etag,
+                        last_modified=_get_last_modified(cached),
+                    ):
+                        return Response(
+                            status_code=304,
+                            headers=_get_validators(cached),
+                        )
+
+                    return Response(
+                        content=cached.body,
+                        status_code=cached.status_code,
+                        headers={**cached.headers, CACHE_HEADER: "HIT"},
+                    )
+
+                response = await handler(request)
+                if response.status_code == 200 and hasattr(response, "body"):
+                    await cache_service.set(
+                        key,
+                        CachedResponse(
+                            body=response.body,
+                            status_code=response.status_code,
+                            headers={
+                                name: value
+                                for name, value in response.headers.items()
+                                if name != "content-length"
+                            },
+                        ),
+                        tags=_make_tags(tags, request),
+                    )
+
+                response.headers[CACHE_HEADER] = "MISS"
+                return response
+
+            return cached_handler
+
+    return CachedRoute
+
+
+def _get_validators(cached: CachedResponse) -> dict[str, str]:
+    return {
+        name: value
+        for name, value in cached.headers.items()
+        if name in ("etag", "last-modified")
+    }
+
+
+def _get_last_modified(cached: CachedResponse) -> datetime | None:
+    last_modified = cached.headers.get("last-modified")
+    return parsedate_to_datetime(last_modified) if last_modified else None
+
+
+def _make_tags(tags: tuple[str, ...], request: Request) -> set[str]:
+    entity_tags = set()
+    for value in request.path_params.values():
+        try:
+            entity_id = uuid.UUID(str(value))
+        except ValueError:
+            continue
+        entity_tags.update(f"{tag}:{entity_id}" for tag in tags)
+
+    return entity_tags or set(tags)
+
+
+def _create_backend() -> CacheBackend:
+    if settings.cache.backend == "redis":
+        return RedisCacheBackend(
+            url=settings.cache.redis_url,
+            ttl=settings.cache.ttl_seconds,
+            key_prefix=settings.cache.key_prefix,
+        )
+
+    return MemoryCacheBackend(
+        ttl=settings.cache.ttl_seconds,
+        max_entries=settings.cache.max_entries,
+    )
+
+
+cache_service = CacheService(backend=_create_backend())
@@ -1,9 +1,9 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-
 BASE_DIR = Path(__file__).parent.parent.parent
 
 
@@ -17,13 +17,30 @@ class ApiPrefix(BaseModel):
 
 
 class AuthorizationConfig(BaseModel):
-    algorithm: str
+    algorithm: Literal["RS256", "ES256", "EdDSA"]
     private_key_path: Path = BASE_DIR / "certs" / "jwt-private.pem"
     public_key_path: Path = BASE_DIR / "certs" / "jwt-public.pem"
+    key_id: str | None = None  # По умолчанию отпечаток ключа (RFC 7638)
+    # Открытые ключи прошлых ротаций: токены, подписанные ими, еще проверяются
+    previous_public_key_paths: list[Path] = []
+    jwks_cache_seconds: int = 86400
     access_token_expire_minutes: int
     refresh_token_expire_days: int
     registration_token_expire_minutes: int
     changing_password_token_expire_minutes: int
+    # Версии токенов кэшируются в процессе: отзыв в других воркерах
+    # применяется не позже чем через token_version_cache_seconds
+    token_version_cache_seconds: int = 30
+    token_version_cache_size: int = 10000
+    user_cache_seconds: int = 30
+    user_negative_cache_seconds: int = 5  # Для несуществующих пользователей
+    user_cache_size: int = 1024
+    revoked_token_cache_size: int = 100000
+
+
+class PasswordConfig(BaseModel):
+    max_workers: int = 4  # Потоки bcrypt, каждый занимает ядро на ~250 мс
+    max_queue: int = 64  # Сверх этого запросы на хеширование получают 503
 
 
 class DatabaseConfig(BaseModel):
@@ -68,10 +85,60 @@ class FileConfig(BaseModel):
     allowed_image_types: set[str]
     allowed_document_types: set[str]
     max_file_size: int
+    chunk_size: int = 64 * 1024
+    max_form_overhead: int = 1024 * 1024  # Текстовые поля и разметка multipart
+    storage_mode: Literal["uuid", "content"] = "uuid"
+    hash_algorithm: Literal["blake2b", "sha256"] = "blake2b"
+    stat_cache_seconds: int = 30
+    stat_cache_size: int = 4096
+    offload_mode: Literal["none", "x-accel", "x-sendfile"] = "none"
+    offload_prefix: str = "/protected-uploads/"  # internal location в nginx
+    # Для текстовых форматов рядом с файлом сохраняются .br и .gz копии
+    compress_extensions: set[str] = {".svg", ".txt", ".csv", ".json", ".xml"}
+    compress_min_size: int = 1024
+    gzip_level: int = 9
+    brotli_quality: int = 11
+    gc_grace_hours: int = 24
+    gc_batch_size: int = 1000
+
+
+class StorageConfig(BaseModel):
+    backend: Literal["local", "s3"] = "local"
+    s3_endpoint_url: str | None = None  # Для MinIO и других S3-совместимых
+    s3_region: str = "us-east-1"
+    s3_bucket: str = "eskro-uploads"
+    s3_access_key: str | None = None
+    s3_secret_key: str | None = None
+    s3_part_size: int = 8 * 1024 * 1024  # Минимум 5 МБ для multipart upload
+    presign_expires_seconds: int = 3600
+
+
+class ImageConfig(BaseModel):
+    widths: list[int] = [320, 640, 1280]
+    quality: int = 80
+    max_workers: int | None = None  # По умолчанию по числу ядер
+    # Наличие созданных копий для srcset проверяется stat-ом и кэшируется
+    derivatives_cache_seconds: int = 300
+    derivatives_negative_cache_seconds: int = 5  # Копии еще создаются
+    derivatives_cache_size: int = 4096
+
+
+class SearchConfig(BaseModel):
+    suggestions_refresh_seconds: int = 300
+    similarity_threshold: float = 0.4
+
+
+class CacheConfig(BaseModel):
+    backend: Literal["memory", "redis"] = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    key_prefix: str = "eskro:cache:"
+    ttl_seconds: int = 300
+    max_entries: int = 1024
 
 
 class HeaderConfig(BaseModel):
     refresh_token_header: str
+    next_cursor_header: str = "X-Next-Cursor"
 
 
 class Settings(BaseSettings):
@@ -85,11 +152,16 @@ class Settings(BaseSettings):
     run: RunConfig
     api: ApiPrefix
     auth: AuthorizationConfig
+    password: PasswordConfig = PasswordConfig()
     db: DatabaseConfig
     email: EmailConfig
     frontend: FrontendConfig
     admin: AdminConfig
     file: FileConfig
+    image: ImageConfig = ImageConfig()
+    storage: StorageConfig = StorageConfig()
+    search: SearchConfig = SearchConfig()
+    cache: CacheConfig = CacheConfig()
     header: HeaderConfig
 
 
@@ -2,24 +2,36 @@ from typing import Any
 from pathlib import Path
 import aiofiles
 import json
+import os
 
 from fastapi import HTTPException, status
 
 from core.config import BASE_DIR
-
+from core.cache.service import cache_service
 
 CONTACTS_PATH = BASE_DIR / "app" / "core" / "contacts" / "contacts.json"
+CACHE_TAG = "contacts"
 
 
 class ContactsService:
     def __init__(self, contacts_path: Path):
         self.contacts_path = contacts_path
+        self._contacts: dict[str, Any] | None = None  # Кэш содержимого файла
+        self._mtime: int | None = None
 
     async def read_contacts(self) -> dict[str, Any]:
         try:
+            # Файл могли переписать в другом воркере, поэтому кэш сверяется
+            # с mtime файла: stat намного дешевле чтения и разбора JSON
+            mtime = os.stat(self.contacts_path).st_mtime_ns
+            if self._contacts is not None and self._mtime == mtime:
+                return dict(self._contacts)
+
             async with aiofiles.open(self.contacts_path, "r", encoding="utf-8") as f:
                 content = await f.read()
-                return json.loads(content)
+                self._contacts = json.loads(content)
+                self._mtime = mtime
+                return dict(self._contacts)
 
         except FileNotFoundError:
             raise HTTPException(
@@ -39,10 +51,16 @@ class ContactsService:
                 await f.write(json.dumps(contacts, ensure_ascii=False, indent=4))
 
         except Exception:
+            self._contacts = None  # Файл мог записаться частично
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save contacts",
             )
 
+        self._contacts = dict(contacts)
+        self._mtime = os.stat(self.contacts_path).st_mtime_ns
+        await cache_service.invalidate(CACHE_TAG)
+        return contacts
+
 
 contacts_service = ContactsService(contacts_path=CONTACTS_PATH)
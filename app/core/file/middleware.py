@@ -0,0 +1,55 @@
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UPLOAD_METHODS = {"POST", "PUT", "PATCH"}
+
+
+class UploadSizeLimitMiddleware:
+    # Ограничивает размер multipart запросов до того, как Starlette
+    # начнет разбирать тело и складывать файлы во временное хранилище
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in UPLOAD_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        # Заявленный размер проверяем сразу, тело даже не читается
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = ORJSONResponse(
+                content={"detail": "File too large"},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        # Content-Length может отсутствовать (chunked) или быть ложным,
+        # поэтому считаем байты и по мере чтения тела
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="File too large",
+                        headers={"Connection": "close"},
+                    )
+
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,16 +1,106 @@
+import asyncio
+import gzip
+import hashlib
 import os
+import posixpath
+import stat
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterator
 
-import aiofiles
+import brotli
 from fastapi import HTTPException, status, UploadFile
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
+from core.db_helper import db_helper
+from core.models import StoredFile
+from core.image.service import image_service
+from core.storage.service import storage_backend
 
-BANNERS_FOLDER = "images/banners"
-EVENTS_FOLDER = "images/events"
-NEWS_FOLDER = "images/news"
-PARTNERS_FOLDER = "images/partners"
+IMAGES_FOLDER = "images"
+BANNERS_FOLDER = f"{IMAGES_FOLDER}/banners"
+EVENTS_FOLDER = f"{IMAGES_FOLDER}/events"
+NEWS_FOLDER = f"{IMAGES_FOLDER}/news"
+PARTNERS_FOLDER = f"{IMAGES_FOLDER}/partners"
+
+UPLOAD_SUFFIX = ".upload"  # Загрузка, для которой еще не посчитан хеш
+
+FILE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+)
+SIGNATURE_TYPES = {content_type for _, content_type in FILE_SIGNATURES} | {"image/webp"}
+
+# Content-Encoding и суффикс сжатой копии в порядке предпочтения
+COMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def sniff_content_type(chunk: bytes) -> str | None:
+    if chunk[:4] == b"RIFF" and chunk[8:12] == b"WEBP":
+        return "image/webp"
+
+    for signature, content_type in FILE_SIGNATURES:
+        if chunk.startswith(signature):
+            return content_type
+
+    return None
+
+
+def compress_file(
+    path: str,
+    min_size: int,
+    gzip_level: int,
+    brotli_quality: int,
+) -> list[str]:
+    # Выполняется в потоке: сжатие делается один раз при сохранении,
+    # а не на каждый запрос
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < min_size:
+        return []
+
+    created = []
+    for encoding, suffix in COMPRESSED_SUFFIXES.items():
+        if encoding == "br":
+            compressed = brotli.compress(
+                data, mode=brotli.MODE_TEXT, quality=brotli_quality
+            )
+        else:
+            compressed = gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+        # Копия не меньше оригинала только зря займет место
+        if len(compressed) >= len(data):
+            continue
+
+        target = f"{path}{suffix}"
+        temp_target = f"{target}.part"
+        with open(temp_target, "wb") as f:
+            f.write(compressed)
+        os.replace(temp_target, target)
+        created.append(target)
+
+    return created
+
+
+@dataclass
+class FileStat:
+    path: Path
+    stat_result: os.stat_result
+    etag: str
+    last_modified: datetime
+    expires_at: float
+    encodings: dict[str, "FileStat"] = field(default_factory=dict)  # Сжатые копии
 
 
 class FileService:
@@ -19,93 +109,306 @@ class FileService:
         self.allowed_image_types: set = settings.file.allowed_image_types
         self.allowed_document_types: set = settings.file.allowed_document_types
         self.max_file_size: int = settings.file.max_file_size
+        self.chunk_size: int = settings.file.chunk_size
+        self.storage_mode: str = settings.file.storage_mode
+        self.hash_algorithm: str = settings.file.hash_algorithm
+        self.stat_cache_seconds: int = settings.file.stat_cache_seconds
+        self.stat_cache_size: int = settings.file.stat_cache_size
+        self.compress_extensions: set[str] = settings.file.compress_extensions
+        self.compress_min_size: int = settings.file.compress_min_size
+        self.gzip_level: int = settings.file.gzip_level
+        self.brotli_quality: int = settings.file.brotli_quality
+        self._stat_cache: OrderedDict[str, FileStat] = OrderedDict()
 
-    async def save_document_file(
-        self, upload_file: UploadFile, subdirectory: str = "documents"
-    ):
-        await self._validate_document_file(upload_file)
+    def get_file_stat(self, file_path: str) -> FileStat:
+        # Результаты resolve() и stat() кэшируются ненадолго, чтобы частые
+        # запросы одних и тех же файлов не ходили в файловую систему
+        file_stat = self._stat_cache.get(file_path)
+        if file_stat and file_stat.expires_at > time.monotonic():
+            self._stat_cache.move_to_end(file_path)
+            return file_stat
 
-        file_extension = os.path.splitext(upload_file.filename)[1]
-        filename = f"{uuid.uuid4().hex}{file_extension}"
+        full_file_path = (self.uploads_dir / file_path).resolve()
+        try:
+            full_file_path.relative_to(self.uploads_dir.resolve())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid file path",
+            )
+
+        try:
+            stat_result = full_file_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found",
+            )
+
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Not a file",
+            )
+
+        file_stat = self._make_file_stat(full_file_path, stat_result)
+        # Сжатые копии проверяются вместе с оригиналом и кэшируются с ним же,
+        # в том числе их отсутствие
+        if self.is_compressible(file_path):
+            for encoding, suffix in COMPRESSED_SUFFIXES.items():
+                compressed_path = full_file_path.with_name(
+                    f"{full_file_path.name}{suffix}"
+                )
+                try:
+                    compressed_stat = compressed_path.stat()
+                except OSError:
+                    continue
+
+                file_stat.encodings[encoding] = self._make_file_stat(
+                    compressed_path, compressed_stat
+                )
+
+        self._stat_cache[file_path] = file_stat
+        self._stat_cache.move_to_end(file_path)
+        while len(self._stat_cache) > self.stat_cache_size:
+            self._stat_cache.popitem(last=False)
+
+        return file_stat
 
-        save_path = self.uploads_dir / subdirectory / filename
-        save_path.parent.mkdir(parents=True, exist_ok=True)
+    def _make_file_stat(self, path: Path, stat_result: os.stat_result) -> FileStat:
+        etag_base = f"{stat_result.st_size}:{stat_result.st_mtime_ns}"
+        return FileStat(
+            path=path,
+            stat_result=stat_result,
+            etag=f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"',
+            last_modified=datetime.fromtimestamp(stat_result.st_mtime, timezone.utc),
+            expires_at=time.monotonic() + self.stat_cache_seconds,
+        )
 
-        async with aiofiles.open(save_path, "wb") as f:
-            content = await upload_file.read()
-            await f.write(content)
+    def is_compressible(self, file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in self.compress_extensions
 
-        relative_path = str(Path(subdirectory) / filename)
-        return relative_path.replace("\\", "/")
+    def get_compressed_paths(self, file_path: str) -> list[str]:
+        if not self.is_compressible(file_path):
+            return []
+
+        return [f"{file_path}{suffix}" for suffix in COMPRESSED_SUFFIXES.values()]
+
+    async def save_document_file(
+        self, upload_file: UploadFile, subdirectory: str = "documents"
+    ) -> str:
+        relative_path, is_new = await self._save_upload_file(
+            upload_file=upload_file,
+            subdirectory=subdirectory,
+            allowed_types=self.allowed_document_types,
+        )
+        if is_new:
+            await self._create_compressed_files(relative_path)
+
+        return relative_path
 
     async def save_image_file(
         self,
         upload_file: UploadFile,
         subdirectory: str,
     ) -> str:
-        await self._validate_image_file(upload_file)
-
-        file_extension = os.path.splitext(upload_file.filename)[1]
-        filename = f"{uuid.uuid4().hex}{file_extension}"
+        relative_path, is_new = await self._save_upload_file(
+            upload_file=upload_file,
+            subdirectory=subdirectory,
+            allowed_types=self.allowed_image_types,
+        )
+        if is_new:
+            # Уменьшенные копии создаются в фоне, ответ их не ждет
+            image_service.schedule_derivatives(relative_path)
+            await self._create_compressed_files(relative_path)
 
-        save_path = self.uploads_dir / subdirectory / filename
-        save_path.parent.mkdir(parents=True, exist_ok=True)
+        return relative_path
 
-        async with aiofiles.open(save_path, "wb") as f:
-            content = await upload_file.read()
-            await f.write(content)
+    async def _create_compressed_files(self, relative_path: str):
+        # Сжатые копии отдает /files/, поэтому они нужны только в локальном хранилище
+        local_path = storage_backend.get_local_path(relative_path)
+        if not local_path or not self.is_compressible(relative_path):
+            return
 
-        relative_path = str(Path(subdirectory) / filename)
-        return relative_path.replace("\\", "/")
+        try:
+            await asyncio.to_thread(
+                compress_file,
+                str(local_path),
+                self.compress_min_size,
+                self.gzip_level,
+                self.brotli_quality,
+            )
+        except OSError:
+            pass  # Без сжатых копий файл отдается как есть
 
-    async def _validate_image_file(
+    async def _save_upload_file(
         self,
         upload_file: UploadFile,
-    ):
-        content = await upload_file.read()
-        if len(content) > self.max_file_size:
+        subdirectory: str,
+        allowed_types: set[str],
+    ) -> tuple[str, bool]:
+        file_extension = os.path.splitext(upload_file.filename or "")[1].lower()
+        file_hash = self._new_hash() if self.storage_mode == "content" else None
+        # Тип проверяется до записи: хранилище сохраняет проверенный тип,
+        # а не заявленный клиентом
+        first_chunk = await upload_file.read(self.chunk_size)
+        if not first_chunk:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File too large",
+                detail="Empty file",
             )
 
-        if upload_file.content_type not in self.allowed_image_types:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid file type",
+        content_type = self._validate_content_type(
+            upload_file, first_chunk, allowed_types
+        )
+        chunks = self._read_upload_file(upload_file, first_chunk, file_hash)
+
+        if not file_hash:
+            relative_path = f"{subdirectory}/{uuid.uuid4().hex}{file_extension}"
+            await storage_backend.put(relative_path, chunks, content_type)
+            return relative_path, True
+
+        # Имя по хешу известно только после чтения всего файла,
+        # поэтому сначала файл сохраняется под временным именем
+        temp_path = f"{subdirectory}/{uuid.uuid4().hex}{UPLOAD_SUFFIX}"
+        size = await storage_backend.put(temp_path, chunks, content_type)
+        try:
+            digest = file_hash.hexdigest()
+            # Двухуровневое шардирование, чтобы не держать все файлы в одной директории
+            relative_path = (
+                f"{subdirectory}/{digest[:2]}/{digest[2:4]}/{digest}{file_extension}"
             )
+            ref_count = await self._add_reference(relative_path, size)
+            if ref_count > 1 and await storage_backend.exists(relative_path):
+                # Обновляем время изменения, чтобы сборщик файлов без ссылок
+                # не удалил файл в период ожидания коммита
+                await storage_backend.touch(relative_path)
+                await storage_backend.delete(temp_path)
+                return relative_path, False
 
-        await upload_file.seek(0)
+            await storage_backend.move(temp_path, relative_path)
+        except BaseException:
+            await storage_backend.delete(temp_path)
+            raise
 
-    async def _validate_document_file(
+        return relative_path, True
+
+    async def _read_upload_file(
         self,
         upload_file: UploadFile,
-    ):
-        content = await upload_file.read()
-        if len(content) > self.max_file_size:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File too large",
-            )
+        first_chunk: bytes,
+        file_hash=None,
+    ) -> AsyncIterator[bytes]:
+        # Файл читается частями, в памяти не больше одного чанка
+        size = 0
+        chunk = first_chunk
+        while chunk:
+            size += len(chunk)
+            if size > self.max_file_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="File too large",
+                )
+
+            if file_hash:
+                file_hash.update(chunk)
+            yield chunk
+            chunk = await upload_file.read(self.chunk_size)
+
+    def _new_hash(self):
+        if self.hash_algorithm == "sha256":
+            return hashlib.sha256()
 
-        if upload_file.content_type not in self.allowed_document_types:
+        return hashlib.blake2b(digest_size=32)
+
+    async def _add_reference(self, path: str, size: int) -> int:
+        async with db_helper.session_factory() as session:
+            stmt = insert(StoredFile).values(path=path, size=size)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StoredFile.path],
+                set_={
+                    "ref_count": StoredFile.ref_count + 1,
+                    "updated_at": func.now(),
+                },
+            ).returning(StoredFile.ref_count)
+            ref_count = await session.scalar(stmt)
+            await session.commit()
+
+            return ref_count
+
+    async def _release_reference(self, session: AsyncSession, path: str) -> bool:
+        # Строка блокируется до коммита, чтобы параллельная загрузка того же
+        # содержимого не получила ссылку на удаляемый файл
+        stmt = select(StoredFile).where(StoredFile.path == path).with_for_update()
+        stored_file = await session.scalar(stmt)
+        if stored_file is None:
+            return True  # Файл сохранен без учета ссылок
+
+        if stored_file.ref_count > 1:
+            stored_file.ref_count -= 1
+            await session.commit()
+            return False
+
+        await session.delete(stored_file)
+        return True
+
+    @staticmethod
+    def _validate_content_type(
+        upload_file: UploadFile,
+        first_chunk: bytes,
+        allowed_types: set[str],
+    ) -> str:
+        # Тип определяется по сигнатуре файла, заявленному content_type
+        # доверяем только для форматов без известной сигнатуры
+        content_type = sniff_content_type(first_chunk)
+        if content_type is None and upload_file.content_type not in SIGNATURE_TYPES:
+            content_type = upload_file.content_type
+
+        if content_type not in allowed_types:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid file type",
             )
 
-        await upload_file.seek(0)
+        return content_type
+
+    async def get_download_url(self, file_path: str) -> str | None:
+        # Для внешнего хранилища файл скачивается по подписанной ссылке
+        return await storage_backend.presign(self._normalize_path(file_path))
 
     async def delete_file(
         self,
         file_path: str,
     ):
-        absolute_path = self.uploads_dir / file_path
-        try:
-            if absolute_path.exists():
-                absolute_path.unlink()
-        except OSError:
-            pass
+        if self.storage_mode != "content":
+            await self._delete(file_path)
+            return
+
+        async with db_helper.session_factory() as session:
+            if await self._release_reference(session=session, path=file_path):
+                # Последняя ссылка: файл удаляется, пока строка заблокирована
+                await self._delete(file_path)
+                await session.commit()
+
+    async def _delete(self, file_path: str):
+        self._stat_cache.pop(file_path, None)
+        await storage_backend.delete(file_path)
+        for compressed_path in self.get_compressed_paths(file_path):
+            await storage_backend.delete(compressed_path)
+
+        if file_path.startswith(f"{IMAGES_FOLDER}/"):
+            await image_service.delete_derivatives(file_path)
+
+    @staticmethod
+    def _normalize_path(file_path: str) -> str:
+        path = posixpath.normpath(file_path)
+        if path.startswith(("/", "../")) or path in (".", ".."):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid file path",
+            )
+
+        return path
 
 
 file_service = FileService()
@@ -0,0 +1,36 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> bool:
+    # If-None-Match приоритетнее If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            # Дата без зоны или с -0000 разбирается как naive, считаем ее UTC
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return last_modified.replace(microsecond=0) <= since
+        except (TypeError, ValueError):
+            return False
+
+    return False
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiofiles
+from PIL import Image, ImageOps
+
+from core.config import settings
+from core.storage.service import storage_backend
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_EXTENSION = ".webp"
+DERIVATIVE_STEM = re.compile(r"_w\d+$")  # Производные: <имя>_w<ширина>.<расширение>
+
+# Форматы оригиналов, в которых дополнительно сохраняются уменьшенные копии
+SAVE_FORMATS = {
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".png": "PNG",
+    ".gif": "GIF",
+    ".webp": "WEBP",
+}
+
+
+def get_derivative_path(path: str, width: int, extension: str) -> str:
+    stem, _ = os.path.splitext(path)
+    return f"{stem}_w{width}{extension}"
+
+
+def get_derivative_extensions(path: str) -> list[str]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SAVE_FORMATS:
+        return []  # Векторные и прочие форматы отдаются как есть
+
+    extensions = [DERIVATIVE_EXTENSION]
+    if extension != DERIVATIVE_EXTENSION:
+        extensions.append(extension)
+
+    return extensions
+
+
+def is_derivative(path: Path) -> bool:
+    return bool(DERIVATIVE_STEM.search(path.stem))
+
+
+async def _read_file(path: str) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(settings.file.chunk_size):
+            yield chunk
+
+
+def generate_derivatives(path: str, widths: list[int], quality: int) -> list[str]:
+    # Выполняется в процессе пула: перекодирование изображений нагружает CPU
+    # и не должно блокировать event loop
+    created = []
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        for width in widths:
+            # Оригиналы уже этой ширины не увеличиваем, но файл все равно создаем,
+            # чтобы srcset всегда ссылался на существующие пути
+            resized = image
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+            for extension in get_derivative_extensions(path):
+                image_format = SAVE_FORMATS[extension]
+                derivative = resized
+                if image_format == "JPEG" and derivative.mode not in ("RGB", "L"):
+                    derivative = derivative.convert("RGB")
+
+                target = get_derivative_path(path, width, extension)
+                temp_target = f"{target}.part"
+                derivative.save(
+                    temp_target,
+                    format=image_format,
+                    quality=quality,
+                    optimize=True,
+                )
+                os.replace(temp_target, target)
+                created.append(target)
+
+    return created
+
+
+class ImageService:
+    def __init__(
+        self,
+        widths: list[int],
+        quality: int,
+        max_workers: int | None,
+        cache_seconds: int,
+        negative_cache_seconds: int,
+        cache_size: int,
+    ):
+        self.widths = sorted(widths)
+        self.quality = quality
+        self.max_workers = max_workers
+        self.cache_seconds = cache_seconds
+        self.negative_cache_seconds = negative_cache_seconds
+        self.cache_size = cache_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # Оригинал -> (созданы ли копии, срок действия записи)
+        self._available: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Пул создается при первой загрузке, а не при импорте модуля
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def schedule_derivatives(self, relative_path: str):
+        task = asyncio.create_task(self.create_derivatives(relative_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def create_derivatives(self, relative_path: str) -> list[str]:
+        try:
+            local_path = storage_backend.get_local_path(relative_path)
+            if local_path:
+                await self._generate(local_path)
+            else:
+                await self._generate_remote(relative_path)
+        except Exception:
+            # Оригинал остается доступен, производные можно создать backfill-ом
+            logger.exception("Failed to create derivatives for %s", relative_path)
+            # Ошибка не исправится сама, ее помним так же долго, как успех
+            self._set_available(relative_path, False, self.cache_seconds)
+            return []
+
+        self._set_available(relative_path, True, self.cache_seconds)
+        return [
+            path
+            for paths in self.get_derivative_paths(relative_path).values()
+            for path in paths.values()
+        ]
+
+    async def _generate(self, path: Path) -> list[str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            generate_derivatives,
+            str(path),
+            self.widths,
+            self.quality,
+        )
+
+    async def _generate_remote(self, relative_path: str):
+        # Оригинал во внешнем хранилище: копии создаются во временной
+        # директории и загружаются рядом с оригиналом
+        directory = posixpath.dirname(relative_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / posixpath.basename(relative_path)
+            async with aiofiles.open(source, "wb") as f:
+                async for chunk in storage_backend.get(relative_path):
+                    await f.write(chunk)
+
+            for derivative in await self._generate(source):
+                name = os.path.basename(derivative)
+                await storage_backend.put(
+                    f"{directory}/{name}",
+                    _read_file(derivative),
+                    mimetypes.guess_type(name)[0],
+                )
+
+    def get_srcset(self, relative_path: str | None) -> dict[str, dict[int, str]]:
+        # Только копии, которые действительно созданы: пока они генерируются
+        # или если оригинал не удалось обработать, клиент берет оригинал
+        if not relative_path or not self.has_derivatives(relative_path):
+            return {}
+
+        return self.get_derivative_paths(relative_path)
+
+    def get_derivative_paths(self, relative_path: str) -> dict[str, dict[int, str]]:
+        return {
+            extension.lstrip("."): {
+                width: get_derivative_path(relative_path, width, extension)
+                for width in self.widths
+            }
+            for extension in get_derivative_extensions(relative_path)
+        }
+
+    def has_derivatives(self, relative_path: str) -> bool:
+        extensions = get_derivative_extensions(relative_path)
+        if not extensions:
+            return False
+
+        cached = self._available.get(relative_path)
+        if cached and cached[1] > time.monotonic():
+            self._available.move_to_end(relative_path)
+            return cached[0]
+
+        # Копии пишутся по возрастанию ширины, поэтому достаточно проверить
+        # последнюю. Для внешнего хранилища синхронной проверки нет: там
+        # учитываются только ошибки генерации в этом процессе
+        local_path = storage_backend.get_local_path(
+            get_derivative_path(relative_path, self.widths[-1], extensions[-1])
+        )
+        available = local_path is None or local_path.is_file()
+        self._set_available(
+            relative_path,
+            available,
+            self.cache_seconds if available else self.negative_cache_seconds,
+        )
+        return available
+
+    def _set_available(self, relative_path: str, available: bool, ttl: int):
+        self._available[relative_path] = (available, time.monotonic() + ttl)
+        self._available.move_to_end(relative_path)
+        while len(self._available) > self.cache_size:
+            self._available.popitem(last=False)
+
+    async def delete_derivatives(self, relative_path: str):
+        self._available.pop(relative_path, None)
+        for paths in self.get_derivative_paths(relative_path).values():
+            for path in paths.values():
+                await storage_backend.delete(path)
+
+    async def close(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+image_service = ImageService(
+    widths=settings.image.widths,
+    quality=settings.image.quality,
+    max_workers=settings.image.max_workers,
+    cache_seconds=settings.image.derivatives_cache_seconds,
+    negative_cache_seconds=settings.image.derivatives_negative_cache_seconds,
+    cache_size=settings.image.derivatives_cache_size,
+)
@@ -11,6 +11,8 @@ from core.models.subscriber import Subscriber
 from core.models.news_type import NewsType
 from core.models.refresh_token import RefreshToken
 from core.models.document import Document
+from core.models.search_document import SearchDocument
+from core.models.stored_file import StoredFile
 
 
 all = (
@@ -27,4 +29,6 @@ all = (
     "Subscriber",
     "NewsType",
     "RefreshToken",
+    "SearchDocument",
+    "StoredFile",
 )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, MetaData
+from sqlalchemy import DateTime, MetaData, func
 from sqlalchemy.orm import DeclarativeBase, declared_attr, Mapped, mapped_column
 
 from core.config import settings
@@ -18,6 +18,12 @@ class Base(DeclarativeBase):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )  # Используется для ETag / Last-Modified
 
     @declared_attr.directive
     def __tablename__(cls) -> str:
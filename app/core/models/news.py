@@ -2,7 +2,8 @@ import uuid
 from typing import TYPE_CHECKING
 from datetime import date
 
-from sqlalchemy import Text, String, ARRAY, ForeignKey
+from sqlalchemy import Text, String, ARRAY, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.models.base import Base
@@ -14,6 +15,20 @@ if TYPE_CHECKING:
 
 class News(Base, IdMixin):
     __tablename__ = "news"
+    __table_args__ = (
+        # Индексы под keyset-пагинацию ленты новостей (в т.ч. с фильтром по типу)
+        Index("ix_news_news_date_id", "news_date", "id"),
+        Index("ix_news_type_id_news_date_id", "type_id", "news_date", "id"),
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+        # Триграммы для нечеткого поиска; индекс по news_keywords_text(keywords)
+        # создается в миграции, т.к. он построен по выражению
+        Index(
+            "ix_news_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     title: Mapped[str] = mapped_column(Text())
     body: Mapped[str] = mapped_column(Text())  # Содержание новости в формате HTML
@@ -27,6 +42,14 @@ class News(Base, IdMixin):
     news_date: Mapped[date]  # Дата новости
     type_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("news_types.id"))
 
+    # Взвешенный tsvector для полнотекстового поиска (title A, keywords B,
+    # min_text C, текст body D), заполняется триггером в БД
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR(),
+        nullable=True,
+        deferred=True,
+    )
+
     type: Mapped["NewsType"] = relationship(
         back_populates="news",
     )  # Тип новости
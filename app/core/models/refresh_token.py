@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from datetime import datetime
 import uuid
 
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.models.base import Base
@@ -14,6 +14,12 @@ if TYPE_CHECKING:
 class RefreshToken(Base):
     # __mapper_args__ = {"exclude_properties": ["id"]}
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Выход со всех устройств отзывает токены по user_id,
+        # очистка удаляет истекшие по expires_at
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
 
     jti: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+
+NEWS_ENTITY = "news"
+PROJECT_ENTITY = "project"
+EVENT_ENTITY = "event"
+DOCUMENT_ENTITY = "document"
+
+
+class SearchDocument(Base):
+    # Денормализованная таблица для общего поиска по новостям, проектам,
+    # мероприятиям и документам (синхронизируется из crud этих сущностей)
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index(
+            "ix_search_documents_search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
+
+    entity_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    entity_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(Text())
+    search_vector: Mapped[str] = mapped_column(TSVECTOR())
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    is_active: Mapped[bool] = mapped_column(default=True, server_default="true")
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+
+
+class StoredFile(Base):
+    # Счетчик ссылок на файл при хранении по хешу содержимого:
+    # одинаковые загрузки указывают на один файл на диске
+    __tablename__ = "stored_files"
+
+    path: Mapped[str] = mapped_column(Text(), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger())
+    ref_count: Mapped[int] = mapped_column(default=1, server_default="1")
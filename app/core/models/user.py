@@ -5,7 +5,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.models.base import Base
 from core.models.mixins.id import IdMixin
-from security.utils import hash_password, validate_password
+from core.password.service import password_service
 
 if TYPE_CHECKING:
     from app.core.models.refresh_token import RefreshToken
@@ -24,6 +24,9 @@ class User(Base, IdMixin):
     )
     _hashed_password: Mapped[bytes] = mapped_column("hashed_password")
     is_active: Mapped[bool] = mapped_column(default=False, server_default="false")
+    # Увеличивается при смене пароля, блокировке и выходе со всех устройств,
+    # выпущенные ранее access токены перестают приниматься
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
         back_populates="user",
@@ -34,28 +37,30 @@ class User(Base, IdMixin):
         self,
         email: str,
         username: str,
-        password: str,
+        hashed_password: bytes,
         role: str = USER_ROLE,
         is_active: bool = False,
     ):
+        # Хеш считается заранее через password_service, чтобы bcrypt
+        # не блокировал event loop
         super().__init__(
             email=email,
             username=username,
-            password=password,
+            _hashed_password=hashed_password,
             role=role,
             is_active=is_active,
         )
-        self.password = password
 
     @property
     def password(self):
         raise AttributeError("Password is not readable")
 
-    @password.setter
-    def password(self, plain_password: str):
-        self._hashed_password = hash_password(password=plain_password)
+    async def set_password(self, plain_password: str):
+        self._hashed_password = await password_service.hash_password(
+            password=plain_password
+        )
 
-    def check_password(self, plain_password: str) -> bool:
-        return validate_password(
+    async def check_password(self, plain_password: str) -> bool:
+        return await password_service.validate_password(
             password=plain_password, hashed_password=self._hashed_password
         )
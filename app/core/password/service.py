@@ -0,0 +1,102 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from security.utils import hash_password, validate_password
+
+T = TypeVar("T")
+
+
+class PasswordService:
+    # bcrypt занимает ~250 мс CPU и отпускает GIL, поэтому выполняется в
+    # отдельном пуле потоков, а не в event loop. Одновременно считается не больше
+    # max_workers хешей, еще max_queue запросов ждут, остальные получают 503
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.running = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="bcrypt",
+            )
+
+        return self._executor
+
+    async def hash_password(self, password: str) -> bytes:
+        return await self._run(hash_password, password)
+
+    async def validate_password(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run(validate_password, password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (
+                self.wait_seconds / self.completed * 1000 if self.completed else 0.0
+            ),
+            "avg_run_ms": (
+                self.run_seconds / self.completed * 1000 if self.completed else 0.0
+            ),
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+password_service = PasswordService(
+    max_workers=settings.password.max_workers,
+    max_queue=settings.password.max_queue,
+)
@@ -0,0 +1,138 @@
+import re
+import uuid
+from datetime import datetime, time, timezone
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert, to_tsvector
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models import News, Project, Event, Document, SearchDocument
+from core.models.search_document import (
+    NEWS_ENTITY,
+    PROJECT_ENTITY,
+    EVENT_ENTITY,
+    DOCUMENT_ENTITY,
+)
+
+# Конфигурация полнотекстового поиска, совпадает с триггером news.search_vector
+TS_CONFIG = "russian"
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+
+class SearchDocumentService:
+    # Записи обновляются в той же транзакции, что и сама сущность,
+    # поэтому коммит остается за вызывающим crud
+    async def save(
+        self,
+        session: AsyncSession,
+        entity_type: str,
+        entity_id: uuid.UUID,
+        title: str,
+        published_at: datetime,
+        is_active: bool = True,
+        keywords: list[str] | None = None,
+        summary: str | None = None,
+        body: str | None = None,
+    ):
+        search_vector = self._weighted_vector(
+            (title, "A"),
+            (" ".join(keywords or []), "B"),
+            (summary or "", "C"),
+            (HTML_TAG_PATTERN.sub(" ", body or ""), "D"),
+        )
+
+        stmt = insert(SearchDocument).values(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            title=title,
+            search_vector=search_vector,
+            published_at=published_at,
+            is_active=is_active,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SearchDocument.entity_type, SearchDocument.entity_id],
+            set_={
+                "title": stmt.excluded.title,
+                "search_vector": stmt.excluded.search_vector,
+                "published_at": stmt.excluded.published_at,
+                "is_active": stmt.excluded.is_active,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await session.execute(stmt)
+
+    async def delete(
+        self,
+        session: AsyncSession,
+        entity_type: str,
+        entity_id: uuid.UUID,
+    ):
+        stmt = delete(SearchDocument).where(
+            SearchDocument.entity_type == entity_type,
+            SearchDocument.entity_id == entity_id,
+        )
+        await session.execute(stmt)
+
+    async def save_news(self, session: AsyncSession, news: News):
+        await self.save(
+            session=session,
+            entity_type=NEWS_ENTITY,
+            entity_id=news.id,
+            title=news.title,
+            published_at=datetime.combine(news.news_date, time.min, timezone.utc),
+            keywords=news.keywords,
+            summary=news.min_text,
+            body=news.body,
+        )
+
+    async def save_project(self, session: AsyncSession, project: Project):
+        await self.save(
+            session=session,
+            entity_type=PROJECT_ENTITY,
+            entity_id=project.id,
+            title=project.title,
+            published_at=project.created_at,
+            is_active=project.is_active,
+            keywords=project.keywords,
+            summary=f"{project.theme} {project.category}",
+            body=project.body,
+        )
+
+    async def save_event(self, session: AsyncSession, event: Event):
+        await self.save(
+            session=session,
+            entity_type=EVENT_ENTITY,
+            entity_id=event.id,
+            title=event.title,
+            published_at=event.event_date or event.created_at,
+            is_active=event.is_active,
+            summary=event.location,
+            body=event.description,
+        )
+
+    async def save_document(self, session: AsyncSession, document: Document):
+        await self.save(
+            session=session,
+            entity_type=DOCUMENT_ENTITY,
+            entity_id=document.id,
+            title=document.title,
+            published_at=document.created_at,
+            is_active=document.is_active,
+        )
+
+    def _weighted_vector(self, *parts: tuple[str, str]):
+        vectors = [
+            func.setweight(to_tsvector(TS_CONFIG, text), weight)
+            for text, weight in parts
+        ]
+        search_vector = vectors[0]
+        for vector in vectors[1:]:
+            search_vector = search_vector.op("||")(vector)
+
+        return search_vector
+
+
+search_document_service = SearchDocumentService()
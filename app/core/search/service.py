@@ -0,0 +1,147 @@
+import asyncio
+import heapq
+import logging
+import uuid
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.models import News
+
+logger = logging.getLogger(__name__)
+
+MIN_WORD_LENGTH = 3  # Короткие слова заголовка не индексируем как начало подсказки
+MAX_SCANNED_KEYS = 1000  # Ограничение перебора для очень коротких префиксов
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().replace("ё", "е").split())
+
+
+@dataclass
+class Suggestion:
+    text: str
+    weight: int = 0
+    keys: set[str] = field(default_factory=set)
+
+
+# Индекс подсказок по префиксу для заголовков и ключевых слов новостей.
+# Живет в памяти воркера: строится при старте, обновляется из crud новостей
+# после коммита и периодически перестраивается целиком
+class SuggestionService:
+    def __init__(self):
+        self._keys: list[str] = []  # Отсортированные ключи для поиска по префиксу
+        self._key_suggestions: dict[str, set[str]] = {}
+        self._suggestions: dict[str, Suggestion] = {}
+        self._news_terms: dict[uuid.UUID, list[str]] = {}
+
+    async def rebuild(self, session: AsyncSession):
+        stmt = select(News.id, News.title, News.keywords)
+        result = await session.stream(stmt)
+
+        index = SuggestionService()
+        async for news_id, title, keywords in result:
+            index._add(news_id, title, keywords, keep_sorted=False)
+        index._keys.sort()
+
+        self._keys = index._keys
+        self._key_suggestions = index._key_suggestions
+        self._suggestions = index._suggestions
+        self._news_terms = index._news_terms
+
+    async def refresh_periodically(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: int,
+    ):
+        # Подтягиваем изменения, сделанные через другие воркеры
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as session:
+                    await self.rebuild(session=session)
+            except Exception:
+                # Оставляем предыдущую версию индекса
+                logger.exception("Failed to rebuild suggestion index")
+
+    def add_news(self, news_id: uuid.UUID, title: str, keywords: list[str]):
+        self.remove_news(news_id)
+        self._add(news_id, title, keywords)
+
+    def remove_news(self, news_id: uuid.UUID):
+        for term in self._news_terms.pop(news_id, []):
+            suggestion = self._suggestions[term]
+            suggestion.weight -= 1
+            if suggestion.weight > 0:
+                continue
+
+            del self._suggestions[term]
+            for key in suggestion.keys:
+                terms = self._key_suggestions[key]
+                terms.discard(term)
+                if not terms:
+                    del self._key_suggestions[key]
+                    del self._keys[bisect_left(self._keys, key)]
+
+    def suggest(self, query: str, limit: int = 5) -> list[str]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        terms = set()
+        position = bisect_left(self._keys, prefix)
+        for key in self._keys[position : position + MAX_SCANNED_KEYS]:
+            if not key.startswith(prefix):
+                break
+            terms.update(self._key_suggestions[key])
+
+        best = heapq.nsmallest(
+            limit,
+            (self._suggestions[term] for term in terms),
+            key=lambda suggestion: (-suggestion.weight, len(suggestion.text)),
+        )
+        return [suggestion.text for suggestion in best]
+
+    def _add(
+        self,
+        news_id: uuid.UUID,
+        title: str,
+        keywords: list[str],
+        keep_sorted: bool = True,
+    ):
+        terms = []
+        for text in {title, *keywords}:
+            term = normalize(text)
+            if not term or term in terms:
+                continue
+
+            terms.append(term)
+            suggestion = self._suggestions.get(term)
+            if suggestion:
+                suggestion.weight += 1
+                continue
+
+            suggestion = Suggestion(text=text.strip(), weight=1)
+            self._suggestions[term] = suggestion
+
+            # Подсказка находится и по началу любого значимого слова
+            words = term.split(" ")
+            for i, word in enumerate(words):
+                if i and len(word) < MIN_WORD_LENGTH:
+                    continue
+                key = " ".join(words[i:])
+                suggestion.keys.add(key)
+                if key not in self._key_suggestions:
+                    self._key_suggestions[key] = set()
+                    if keep_sorted:
+                        insort(self._keys, key)
+                    else:
+                        self._keys.append(key)
+                self._key_suggestions[key].add(term)
+
+        self._news_terms[news_id] = terms
+
+
+suggestion_service = SuggestionService()
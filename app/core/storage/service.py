@@ -0,0 +1,429 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator
+
+import aiofiles
+import aiofiles.os
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+
+from core.config import settings
+
+TEMP_SUFFIX = ".part"
+
+
+@dataclass
+class StorageObject:
+    path: str
+    size: int
+    modified_at: float  # Unix timestamp
+
+
+class StorageBackend(ABC):
+    # Пути везде относительные ("images/news/<имя>"), как они хранятся в базе.
+    # put записывает объект целиком или не записывает вовсе и возвращает размер,
+    # presign возвращает ссылку для скачивания в обход API (None - отдает API)
+
+    @abstractmethod
+    async def put(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None = None,
+    ) -> int: ...
+
+    @abstractmethod
+    def get(self, path: str) -> AsyncIterator[bytes]: ...
+
+    @abstractmethod
+    async def move(self, source_path: str, target_path: str): ...
+
+    @abstractmethod
+    async def exists(self, path: str) -> bool: ...
+
+    @abstractmethod
+    async def touch(self, path: str): ...
+
+    @abstractmethod
+    async def delete(self, path: str): ...
+
+    @abstractmethod
+    async def presign(self, path: str) -> str | None: ...
+
+    @abstractmethod
+    def list_files(
+        self,
+        exclude: Callable[[str], bool] | None = None,
+    ) -> AsyncIterator[list[StorageObject]]: ...
+
+    def get_local_path(self, path: str) -> Path | None:
+        return None
+
+    async def close(self):
+        pass
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: Path, chunk_size: int, batch_size: int):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    async def put(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None = None,
+    ) -> int:
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Временный файл в той же директории, чтобы rename был атомарным
+        temp_target = target.with_name(f"{target.name}{TEMP_SUFFIX}")
+
+        size = 0
+        try:
+            async with aiofiles.open(temp_target, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    await f.write(chunk)
+
+            await aiofiles.os.replace(temp_target, target)
+        except BaseException:
+            try:
+                await aiofiles.os.remove(temp_target)
+            except OSError:
+                pass
+            raise
+
+        return size
+
+    async def get(self, path: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self.root / path, "rb") as f:
+            while chunk := await f.read(self.chunk_size):
+                yield chunk
+
+    async def move(self, source_path: str, target_path: str):
+        target = self.root / target_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        await aiofiles.os.replace(self.root / source_path, target)
+
+    async def exists(self, path: str) -> bool:
+        return await aiofiles.os.path.isfile(self.root / path)
+
+    async def touch(self, path: str):
+        await asyncio.to_thread((self.root / path).touch)
+
+    async def delete(self, path: str):
+        try:
+            await aiofiles.os.remove(self.root / path)
+        except OSError:
+            pass
+
+    async def presign(self, path: str) -> str | None:
+        return None
+
+    async def list_files(
+        self,
+        exclude: Callable[[str], bool] | None = None,
+    ) -> AsyncIterator[list[StorageObject]]:
+        # os.scandir отдает записи итератором: в памяти только одна пачка,
+        # а обход файловой системы идет в потоке, не блокируя event loop
+        if not self.root.exists():
+            return
+
+        directories = [str(self.root)]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                while True:
+                    count, subdirectories, files = await asyncio.to_thread(
+                        self._scan_entries, entries, exclude
+                    )
+                    if not count:
+                        break
+
+                    directories.extend(subdirectories)
+                    if files:
+                        yield files
+
+    def _scan_entries(
+        self,
+        entries: Iterator[os.DirEntry],
+        exclude: Callable[[str], bool] | None,
+    ) -> tuple[int, list[str], list[StorageObject]]:
+        # stat вызывается только для файлов, которые не отфильтрованы exclude
+        root = str(self.root)
+        count = 0
+        directories = []
+        files = []
+        for entry in islice(entries, self.batch_size):
+            count += 1
+            # Служебные файлы вроде .keep не являются загрузками
+            if entry.name.startswith("."):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                directories.append(entry.path)
+                continue
+
+            if not entry.is_file(follow_symlinks=False):
+                continue
+
+            path = os.path.relpath(entry.path, root).replace("\\", "/")
+            if exclude and exclude(path):
+                continue
+
+            stat_result = entry.stat(follow_symlinks=False)
+            files.append(
+                StorageObject(
+                    path=path,
+                    size=stat_result.st_size,
+                    modified_at=stat_result.st_mtime,
+                )
+            )
+
+        return count, directories, files
+
+    def get_local_path(self, path: str) -> Path | None:
+        return self.root / path
+
+
+class S3StorageBackend(StorageBackend):
+    # Любое S3-совместимое хранилище (AWS S3, MinIO, Yandex Object Storage)
+    def __init__(
+        self,
+        endpoint_url: str | None,
+        region: str,
+        bucket: str,
+        access_key: str | None,
+        secret_key: str | None,
+        part_size: int,
+        presign_expires_seconds: int,
+        chunk_size: int,
+        batch_size: int,
+    ):
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.part_size = part_size
+        self.presign_expires_seconds = presign_expires_seconds
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+
+    async def _get_client(self):
+        # Клиент создается один раз и переиспользует пул соединений
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await self._exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        region_name=self.region,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                    )
+                )
+
+        return self._client
+
+    async def put(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None = None,
+    ) -> int:
+        client = await self._get_client()
+        extra = {"ContentType": content_type} if content_type else {}
+
+        # Файл уходит частями multipart upload, в памяти не больше одной части.
+        # Маленькие файлы загружаются одним PUT
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                buffer += chunk
+                if len(buffer) < self.part_size:
+                    continue
+
+                if upload_id is None:
+                    response = await client.create_multipart_upload(
+                        Bucket=self.bucket, Key=path, **extra
+                    )
+                    upload_id = response["UploadId"]
+
+                parts.append(await self._upload_part(path, upload_id, parts, buffer))
+                buffer.clear()
+
+            if upload_id is None:
+                await client.put_object(
+                    Bucket=self.bucket, Key=path, Body=bytes(buffer), **extra
+                )
+                return size
+
+            if buffer:
+                parts.append(await self._upload_part(path, upload_id, parts, buffer))
+
+            await client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=path,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                try:
+                    await client.abort_multipart_upload(
+                        Bucket=self.bucket, Key=path, UploadId=upload_id
+                    )
+                except ClientError:
+                    pass
+            raise
+
+        return size
+
+    async def _upload_part(
+        self,
+        path: str,
+        upload_id: str,
+        parts: list[dict],
+        buffer: bytearray,
+    ) -> dict:
+        client = await self._get_client()
+        part_number = len(parts) + 1
+        response = await client.upload_part(
+            Bucket=self.bucket,
+            Key=path,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=bytes(buffer),
+        )
+
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def get(self, path: str) -> AsyncIterator[bytes]:
+        client = await self._get_client()
+        response = await client.get_object(Bucket=self.bucket, Key=path)
+        body = response["Body"]
+        async with body:
+            async for chunk in body.iter_chunks(self.chunk_size):
+                yield chunk
+
+    async def move(self, source_path: str, target_path: str):
+        client = await self._get_client()
+        await client.copy_object(
+            Bucket=self.bucket,
+            Key=target_path,
+            CopySource={"Bucket": self.bucket, "Key": source_path},
+        )
+        await client.delete_object(Bucket=self.bucket, Key=source_path)
+
+    async def exists(self, path: str) -> bool:
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=path)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+        return True
+
+    async def touch(self, path: str):
+        # Копирование объекта в самого себя обновляет LastModified. S3 принимает
+        # такую копию только с MetadataDirective=REPLACE, поэтому метаданные
+        # передаются заново, иначе тип сбросится в binary/octet-stream
+        client = await self._get_client()
+        head = await client.head_object(Bucket=self.bucket, Key=path)
+        extra = {
+            name: head[name]
+            for name in (
+                "ContentType",
+                "CacheControl",
+                "ContentDisposition",
+                "ContentEncoding",
+                "ContentLanguage",
+            )
+            if head.get(name)
+        }
+        await client.copy_object(
+            Bucket=self.bucket,
+            Key=path,
+            CopySource={"Bucket": self.bucket, "Key": path},
+            MetadataDirective="REPLACE",
+            Metadata=head.get("Metadata", {}),
+            **extra,
+        )
+
+    async def delete(self, path: str):
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=path)
+
+    async def presign(self, path: str) -> str | None:
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": path},
+            ExpiresIn=self.presign_expires_seconds,
+        )
+
+    async def list_files(
+        self,
+        exclude: Callable[[str], bool] | None = None,
+    ) -> AsyncIterator[list[StorageObject]]:
+        client = await self._get_client()
+        paginator = client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=self.bucket,
+            PaginationConfig={"PageSize": self.batch_size},
+        ):
+            files = [
+                StorageObject(
+                    path=item["Key"],
+                    size=item["Size"],
+                    modified_at=item["LastModified"].timestamp(),
+                )
+                for item in page.get("Contents", [])
+                if not (exclude and exclude(item["Key"]))
+            ]
+            if files:
+                yield files
+
+    async def close(self):
+        await self._exit_stack.aclose()
+        self._client = None
+
+
+def _create_backend() -> StorageBackend:
+    if settings.storage.backend == "s3":
+        return S3StorageBackend(
+            endpoint_url=settings.storage.s3_endpoint_url,
+            region=settings.storage.s3_region,
+            bucket=settings.storage.s3_bucket,
+            access_key=settings.storage.s3_access_key,
+            secret_key=settings.storage.s3_secret_key,
+            part_size=settings.storage.s3_part_size,
+            presign_expires_seconds=settings.storage.presign_expires_seconds,
+            chunk_size=settings.file.chunk_size,
+            batch_size=settings.file.gc_batch_size,
+        )
+
+    return LocalStorageBackend(
+        root=settings.file.uploads_dir,
+        chunk_size=settings.file.chunk_size,
+        batch_size=settings.file.gc_batch_size,
+    )
+
+
+storage_backend = _create_backend()
@@ -9,11 +9,18 @@ from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from cleanup_tokens import setup_cleanup_tokens
+from cleanup_uploads import setup_cleanup_uploads
 from core.config import settings
 from core.db_helper import db_helper
 from core.models import Base
 from api import router as api_router
 from core.admin.service import admin_service
+from core.search.service import suggestion_service
+from core.cache.service import cache_service
+from core.file.middleware import UploadSizeLimitMiddleware
+from core.image.service import image_service
+from core.storage.service import storage_backend
+from core.password.service import password_service
 
 
 @asynccontextmanager
@@ -21,15 +28,37 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with db_helper.session_factory() as session:  # Создаем администратора
         await admin_service.create_admin(session=session)
 
+    async with db_helper.session_factory() as session:  # Строим индекс подсказок
+        await suggestion_service.rebuild(session=session)
+
     # Запускаем cron на очистку таблицы с токенами
     cleanup_tokens_task = asyncio.create_task(setup_cleanup_tokens())
+    # Запускаем cron на удаление файлов, на которые нет ссылок
+    cleanup_uploads_task = asyncio.create_task(setup_cleanup_uploads())
+    # Периодически перестраиваем индекс подсказок
+    refresh_suggestions_task = asyncio.create_task(
+        suggestion_service.refresh_periodically(
+            session_factory=db_helper.session_factory,
+            interval=settings.search.suggestions_refresh_seconds,
+        )
+    )
     yield
 
-    cleanup_tokens_task.cancel()
-    try:
-        await cleanup_tokens_task
-    except asyncio.CancelledError:
-        pass
+    for task in (
+        cleanup_tokens_task,
+        cleanup_uploads_task,
+        refresh_suggestions_task,
+    ):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    await cache_service.close()
+    await image_service.close()
+    await storage_backend.close()
+    password_service.close()
 
 
 app = FastAPI(
@@ -37,12 +66,18 @@ app = FastAPI(
     default_response_class=ORJSONResponse,  # Ускоряет работу с сериализацией и десериализацией JSON
 )
 
+# Добавленный последним middleware внешний: CORS оборачивает ранние ответы 413
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.file.max_file_size + settings.file.max_form_overhead,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[settings.header.next_cursor_header],
 )
 
 app.include_router(router=api_router, prefix=settings.api.prefix)
@@ -0,0 +1,36 @@
+"""News keyset indexes
+
+Revision ID: 5b1e0c7d9a42
+Revises: d2adcbce86b8
+Create Date: 2026-10-18 10:10:41.517203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e0c7d9a42"
+down_revision: Union[str, Sequence[str], None] = "d2adcbce86b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_news_news_date_id", "news", ["news_date", "id"], unique=False)
+    op.create_index(
+        "ix_news_type_id_news_date_id",
+        "news",
+        ["type_id", "news_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_news_type_id_news_date_id", table_name="news")
+    op.drop_index("ix_news_news_date_id", table_name="news")
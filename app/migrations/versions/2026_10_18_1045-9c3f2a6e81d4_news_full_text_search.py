@@ -0,0 +1,106 @@
+"""News full text search
+
+Revision ID: 9c3f2a6e81d4
+Revises: 5b1e0c7d9a42
+Create Date: 2026-10-18 10:45:12.208841
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3f2a6e81d4"
+down_revision: Union[str, Sequence[str], None] = "5b1e0c7d9a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Колонка заполняется триггером, а не GENERATED ... STORED: добавление
+# генерируемой колонки переписывает всю таблицу под эксклюзивной блокировкой
+NEWS_SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(
+            to_tsvector('russian', coalesce(array_to_string(NEW.keywords, ' '), '')),
+            'B'
+        ) ||
+        setweight(to_tsvector('russian', coalesce(NEW.min_text, '')), 'C') ||
+        setweight(
+            to_tsvector(
+                'russian',
+                regexp_replace(coalesce(NEW.body, ''), '<[^>]*>', ' ', 'g')
+            ),
+            'D'
+        );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+NEWS_SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER news_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, keywords, min_text, body ON news
+FOR EACH ROW EXECUTE FUNCTION news_search_vector_update()
+"""
+
+NEWS_SEARCH_VECTOR_BACKFILL = sa.text(
+    """
+    UPDATE news SET title = title
+    WHERE id IN (
+        SELECT id FROM news
+        WHERE search_vector IS NULL
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    """
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "news",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.execute(NEWS_SEARCH_VECTOR_FUNCTION)
+    op.execute(NEWS_SEARCH_VECTOR_TRIGGER)
+
+    # Заполняем существующие строки пачками, каждая пачка в своей транзакции
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            result = connection.execute(
+                NEWS_SEARCH_VECTOR_BACKFILL,
+                {"batch_size": BACKFILL_BATCH_SIZE},
+            )
+            if result.rowcount < BACKFILL_BATCH_SIZE:
+                break
+
+        op.create_index(
+            "ix_news_search_vector",
+            "news",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_news_search_vector",
+        table_name="news",
+        postgresql_using="gin",
+    )
+    op.execute("DROP TRIGGER IF EXISTS news_search_vector_trigger ON news")
+    op.execute("DROP FUNCTION IF EXISTS news_search_vector_update()")
+    op.drop_column("news", "search_vector")
@@ -0,0 +1,59 @@
+"""News trigram indexes
+
+Revision ID: e47a1d93b5c0
+Revises: 9c3f2a6e81d4
+Create Date: 2026-10-18 11:30:27.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e47a1d93b5c0"
+down_revision: Union[str, Sequence[str], None] = "9c3f2a6e81d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# array_to_string не IMMUTABLE, поэтому для индекса по выражению нужна обертка
+NEWS_KEYWORDS_TEXT_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_keywords_text(keywords varchar[]) RETURNS text
+AS $$ SELECT array_to_string(keywords, ' ') $$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(NEWS_KEYWORDS_TEXT_FUNCTION)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_title_trgm",
+            "news",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_keywords_trgm "
+            "ON news USING gin (news_keywords_text(keywords) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_news_keywords_trgm")
+    op.drop_index(
+        "ix_news_title_trgm",
+        table_name="news",
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.execute("DROP FUNCTION IF EXISTS news_keywords_text(varchar[])")
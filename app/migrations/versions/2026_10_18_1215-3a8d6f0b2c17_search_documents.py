@@ -0,0 +1,112 @@
+"""Search documents
+
+Revision ID: 3a8d6f0b2c17
+Revises: e47a1d93b5c0
+Create Date: 2026-10-18 12:15:06.331942
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a8d6f0b2c17"
+down_revision: Union[str, Sequence[str], None] = "e47a1d93b5c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Веса совпадают с SearchDocumentService: title A, keywords B, summary C, body D
+SEARCH_DOCUMENTS_BACKFILL = {
+    "news": """
+        INSERT INTO search_documents
+            (entity_type, entity_id, title, search_vector, published_at, is_active, created_at)
+        SELECT
+            'news', id, title,
+            setweight(to_tsvector('russian', title), 'A') ||
+            setweight(to_tsvector('russian', array_to_string(keywords, ' ')), 'B') ||
+            setweight(to_tsvector('russian', min_text), 'C') ||
+            setweight(to_tsvector('russian', regexp_replace(body, '<[^>]*>', ' ', 'g')), 'D'),
+            news_date::timestamptz, true, now()
+        FROM news
+        ON CONFLICT DO NOTHING
+    """,
+    "projects": """
+        INSERT INTO search_documents
+            (entity_type, entity_id, title, search_vector, published_at, is_active, created_at)
+        SELECT
+            'project', id, title,
+            setweight(to_tsvector('russian', title), 'A') ||
+            setweight(to_tsvector('russian', array_to_string(keywords, ' ')), 'B') ||
+            setweight(to_tsvector('russian', theme || ' ' || category), 'C') ||
+            setweight(to_tsvector('russian', regexp_replace(body, '<[^>]*>', ' ', 'g')), 'D'),
+            created_at, is_active, now()
+        FROM projects
+        ON CONFLICT DO NOTHING
+    """,
+    "events": """
+        INSERT INTO search_documents
+            (entity_type, entity_id, title, search_vector, published_at, is_active, created_at)
+        SELECT
+            'event', id, title,
+            setweight(to_tsvector('russian', title), 'A') ||
+            setweight(to_tsvector('russian', coalesce(location, '')), 'C') ||
+            setweight(to_tsvector('russian', description), 'D'),
+            coalesce(event_date::timestamptz, created_at), is_active, now()
+        FROM events
+        ON CONFLICT DO NOTHING
+    """,
+    "documents": """
+        INSERT INTO search_documents
+            (entity_type, entity_id, title, search_vector, published_at, is_active, created_at)
+        SELECT
+            'document', id, title,
+            setweight(to_tsvector('russian', title), 'A'),
+            created_at, is_active, now()
+        FROM documents
+        ON CONFLICT DO NOTHING
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "search_documents",
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default="true", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "entity_type", "entity_id", name=op.f("pk_search_documents")
+        ),
+    )
+    op.create_index(
+        "ix_search_documents_search_vector",
+        "search_documents",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    connection = op.get_bind()
+    for table_name, backfill in SEARCH_DOCUMENTS_BACKFILL.items():
+        # Таблица documents есть в моделях, но могла не попасть в схему
+        if sa.inspect(connection).has_table(table_name):
+            op.execute(backfill)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_search_documents_search_vector",
+        table_name="search_documents",
+        postgresql_using="gin",
+    )
+    op.drop_table("search_documents")
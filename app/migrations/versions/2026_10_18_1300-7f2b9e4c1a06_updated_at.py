@@ -0,0 +1,85 @@
+"""Updated at
+
+Revision ID: 7f2b9e4c1a06
+Revises: 3a8d6f0b2c17
+Create Date: 2026-10-18 13:00:41.508214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f2b9e4c1a06"
+down_revision: Union[str, Sequence[str], None] = "3a8d6f0b2c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPDATED_AT_TABLES = (
+    "banners",
+    "events",
+    "feedbacks",
+    "news_types",
+    "partners",
+    "polls",
+    "projects",
+    "users",
+    "news",
+    "refresh_tokens",
+    "subscribers",
+    "search_documents",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in UPDATED_AT_TABLES:
+        # now() в server_default заполняет существующие строки без отдельного UPDATE
+        op.add_column(
+            table_name,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+    # Таблица documents есть в моделях, но не попала в начальную миграцию
+    if not sa.inspect(op.get_bind()).has_table("documents"):
+        op.create_table(
+            "documents",
+            sa.Column("title", sa.Text(), nullable=False),
+            sa.Column("file_url", sa.Text(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), server_default="true", nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.Column("id", sa.Uuid(), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_documents")),
+        )
+    else:
+        op.add_column(
+            "documents",
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # documents остаётся: до этой миграции таблица могла уже существовать
+    op.drop_column("documents", "updated_at")
+    for table_name in reversed(UPDATED_AT_TABLES):
+        op.drop_column(table_name, "updated_at")
@@ -0,0 +1,32 @@
+"""User token version
+
+Revision ID: c5e9a3d70f18
+Revises: b8d41f6e2a93
+Create Date: 2026-10-18 14:00:27.316580
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e9a3d70f18"
+down_revision: Union[str, Sequence[str], None] = "b8d41f6e2a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
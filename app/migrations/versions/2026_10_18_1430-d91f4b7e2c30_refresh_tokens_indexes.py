@@ -0,0 +1,41 @@
+"""Refresh tokens indexes
+
+Revision ID: d91f4b7e2c30
+Revises: c5e9a3d70f18
+Create Date: 2026-10-18 14:30:52.640193
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d91f4b7e2c30"
+down_revision: Union[str, Sequence[str], None] = "c5e9a3d70f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_user_id",
+        "refresh_tokens",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_refresh_tokens_expires_at",
+        "refresh_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
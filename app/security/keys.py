@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt import InvalidTokenError
+
+from core.config import settings
+
+# Обязательные поля JWK для отпечатка ключа (RFC 7638)
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+@dataclass
+class VerificationKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    jwk: dict
+
+
+def get_key_algorithm(public_key) -> str:
+    # EdDSA и ES256 подписывают и проверяют в разы быстрее RS256
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+
+    raise ValueError("Unsupported JWT key type")
+
+
+def make_verification_key(public_key, kid: str | None = None) -> VerificationKey:
+    algorithm = get_key_algorithm(public_key)
+    jwk = jwt.get_algorithm_by_name(algorithm).to_jwk(public_key, as_dict=True)
+    if kid is None:
+        members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+        digest = hashlib.sha256(
+            json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+        ).digest()
+        kid = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+    jwk.update(kid=kid, alg=algorithm, use="sig")
+    return VerificationKey(kid=kid, algorithm=algorithm, public_key=public_key, jwk=jwk)
+
+
+class KeyManager:
+    # Ключи разбираются из PEM один раз при старте, PyJWT получает готовые
+    # объекты cryptography. Токены подписываются текущим ключом с его kid,
+    # а проверяются любым ключом из связки: после смены ключа старые токены
+    # действуют до истечения срока
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        algorithm: str,
+        key_id: str | None = None,
+        previous_public_key_paths: list[Path] | None = None,
+    ):
+        self.private_key = serialization.load_pem_private_key(
+            private_key_path.read_bytes(),
+            password=None,
+        )
+        self.public_key_pem = public_key_path.read_text()
+        self.signing_key = make_verification_key(
+            serialization.load_pem_public_key(self.public_key_pem.encode()),
+            kid=key_id,
+        )
+        if self.signing_key.algorithm != algorithm:
+            raise ValueError(
+                f"JWT key is {self.signing_key.algorithm}, "
+                f"but AUTH__ALGORITHM is {algorithm}"
+            )
+
+        self.keys: dict[str, VerificationKey] = {self.signing_key.kid: self.signing_key}
+        for path in previous_public_key_paths or []:
+            key = make_verification_key(
+                serialization.load_pem_public_key(path.read_bytes())
+            )
+            self.keys.setdefault(key.kid, key)
+
+        self.jwks = json.dumps(
+            {"keys": [key.jwk for key in self.keys.values()]},
+            separators=(",", ":"),
+        ).encode()
+        self.jwks_etag = f'"{hashlib.sha1(self.jwks).hexdigest()}"'
+
+    def encode(self, payload: dict) -> str:
+        return jwt.encode(
+            payload=payload,
+            key=self.private_key,
+            algorithm=self.signing_key.algorithm,
+            headers={"kid": self.signing_key.kid},
+        )
+
+    def decode(self, token: str | bytes) -> Any:
+        kid = jwt.get_unverified_header(token).get("kid")
+        # Токены без kid выпущены до появления связки ключей
+        key = self.keys.get(kid) if kid else self.signing_key
+        if key is None:
+            raise InvalidTokenError("Unknown key id")
+
+        return jwt.decode(
+            jwt=token,
+            key=key.public_key,
+            algorithms=[key.algorithm],
+        )
+
+
+key_manager = KeyManager(
+    private_key_path=settings.auth.private_key_path,
+    public_key_path=settings.auth.public_key_path,
+    algorithm=settings.auth.algorithm,
+    key_id=settings.auth.key_id,
+    previous_public_key_paths=settings.auth.previous_public_key_paths,
+)
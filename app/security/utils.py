@@ -1,10 +1,10 @@
 from typing import Any
 from datetime import datetime, timedelta, timezone
 
-import jwt
 import bcrypt
 
 from core.config import settings
+from security.keys import key_manager
 
 
 def hash_password(password: str) -> bytes:
@@ -27,8 +27,6 @@ def validate_password(
 
 def encode_jwt(
     payload: dict,
-    private_key: str = settings.auth.private_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
     expire_minutes: int | None = settings.auth.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None,
 ) -> str:
@@ -48,24 +46,8 @@ def encode_jwt(
             iat=now,
         )
 
-    encoded = jwt.encode(
-        payload=to_encode,
-        key=private_key,
-        algorithm=algorithm,
-    )
-
-    return encoded
+    return key_manager.encode(payload=to_encode)
 
 
-def decode_jwt(
-    token: str | bytes,
-    public_key: str = settings.auth.public_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
-) -> Any:
-    decoded = jwt.decode(
-        jwt=token,
-        key=public_key,
-        algorithms=[algorithm],
-    )
-
-    return decoded
+def decode_jwt(token: str | bytes) -> Any:
+    return key_manager.decode(token=token)